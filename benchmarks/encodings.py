@@ -0,0 +1,82 @@
+"""
+Times each placement model encoding on random instances of increasing size and
+connection density, with and without IC-like sequential groups. Used to set
+the thresholds in optimise.chooseEncoding. The instances are larger than
+optimise.EXACT_MAX_STRIPS, as smaller ones are not solved with CP-SAT.
+
+    python benchmarks/encodings.py [time limit per solve, default 2 s]
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+
+from wadjet.optimise import optimisePlacement
+
+ENCODINGS = ("position", "interval", "ordering")
+
+
+def randomModel(num_strips, degree, ic_strips, seed):
+    """
+    Random connected pairs with the given mean degree, and groups of four
+    consecutive strips covering ic_strips of the strips.
+    """
+
+    rng = random.Random(seed)
+
+    num_pairs = max(1, round(degree * num_strips / 2))
+    connected_pairs = set()
+    for s in range(1, num_strips):
+        # A spanning tree so that the model does not decompose
+        connected_pairs.add((rng.randrange(s), s))
+    while len(connected_pairs) < num_pairs:
+        s1, s2 = sorted(rng.sample(range(num_strips), 2))
+        connected_pairs.add((s1, s2))
+
+    strips = list(range(num_strips))
+    rng.shuffle(strips)
+    sequential_groups = [strips[i : i + 4] for i in range(0, ic_strips - 3, 4)]
+
+    return sorted(connected_pairs), sequential_groups
+
+
+if __name__ == "__main__":
+
+    time_limit = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    print(
+        f"{'strips':>6} {'degree':>6} {'ic':>4} "
+        + " ".join(f"{encoding:>10}" for encoding in ENCODINGS)
+    )
+
+    for num_strips in (20, 30, 40):
+        for degree in (2, 3, 5):
+            for ic_fraction in (0.0, 0.5):
+                ic_strips = int(ic_fraction * num_strips)
+                connected_pairs, sequential_groups = randomModel(
+                    num_strips, degree, ic_strips, seed=num_strips * degree
+                )
+
+                times = []
+                for encoding in ENCODINGS:
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = optimisePlacement(
+                            connected_pairs,
+                            sequential_groups,
+                            time_limit=time_limit,
+                            encoding=encoding,
+                        )
+                    elapsed = time.perf_counter() - start
+                    # Solves that time out show the objective they reached
+                    if result.optimal:
+                        times.append(f"{elapsed:.3f}s")
+                    else:
+                        times.append(f"obj {result.objective:.0f}")
+
+                print(
+                    f"{num_strips:>6} {degree:>6} {ic_strips:>4} "
+                    + " ".join(f"{t:>10}" for t in times)
+                )
@@ -0,0 +1,63 @@
+"""
+Times exactPlacement against the CP-SAT model chosen by chooseEncoding on random
+instances around EXACT_MAX_STRIPS strips, with and without IC-like sequential
+groups. Used to set EXACT_MAX_STRIPS in optimise.
+
+    python benchmarks/exact.py [time limit per CP-SAT solve, default 10 s]
+"""
+
+import importlib.util
+import os
+import sys
+import time
+
+from wadjet.optimise import chooseEncoding, exactPlacement, optimisePlacement
+
+# The instances of benchmarks/encodings.py, loaded from its file as its name is
+# taken by the standard library
+spec = importlib.util.spec_from_file_location(
+    "encodings_benchmark", os.path.join(os.path.dirname(__file__), "encodings.py")
+)
+encodings_benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(encodings_benchmark)
+randomModel = encodings_benchmark.randomModel
+
+if __name__ == "__main__":
+
+    time_limit = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    print(f"{'strips':>6} {'degree':>6} {'ic':>4} {'exact':>10} {'cp-sat':>10}")
+
+    for num_strips in (8, 12, 16, 18, 20, 22):
+        for degree in (2, 4):
+            for ic_fraction in (0.0, 0.5):
+                ic_strips = int(ic_fraction * num_strips)
+                connected_pairs, sequential_groups = randomModel(
+                    num_strips, degree, ic_strips, seed=num_strips * degree
+                )
+
+                start = time.perf_counter()
+                exact = exactPlacement(connected_pairs, sequential_groups)
+                exact_time = f"{time.perf_counter() - start:.3f}s"
+
+                start = time.perf_counter()
+                result = optimisePlacement(
+                    connected_pairs,
+                    sequential_groups,
+                    time_limit=time_limit,
+                    encoding=chooseEncoding(
+                        connected_pairs, sequential_groups, num_strips
+                    ),
+                )
+                elapsed = time.perf_counter() - start
+                # Solves that time out show their remaining gap instead
+                if result.optimal:
+                    assert result.objective == exact.objective
+                    model_time = f"{elapsed:.3f}s"
+                else:
+                    model_time = f"gap {result.gap:.2f}"
+
+                print(
+                    f"{num_strips:>6} {degree:>6} {ic_strips:>4} "
+                    f"{exact_time:>10} {model_time:>10}"
+                )
@@ -0,0 +1,44 @@
+"""
+Times drawing and saving a Stripboard at increasing board sizes, with one
+component per column and an IC every ten columns.
+
+    python benchmarks/render.py
+"""
+
+import os
+import tempfile
+import time
+
+import matplotlib as mpl
+
+mpl.use("Agg")
+import matplotlib.pyplot as plt
+
+from wadjet.graphics import Stripboard
+
+
+def renderBoardOfSize(N, file_name):
+    board = Stripboard(N)
+
+    for x in range(N):
+        if x % 10 == 9:
+            board.add_ic((x, (x * 7) % max(1, N - 4)), 8, name=f"U{x}")
+        else:
+            y1 = (x * 3) % N
+            y2 = (x * 5 + 1) % N
+            board.add_component((x, y1), (x, y2), color="red", name=f"R{x}")
+
+    board.savefig(file_name)
+    plt.close(board.fig)
+
+
+if __name__ == "__main__":
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "board.png")
+
+        print(f"{'N':>5} {'seconds':>10}")
+        for N in (8, 20, 40, 60, 80, 100):
+            start = time.perf_counter()
+            renderBoardOfSize(N, file_name)
+            print(f"{N:>5} {time.perf_counter() - start:>10.3f}")
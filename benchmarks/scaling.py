@@ -0,0 +1,123 @@
+"""
+Times each stage of placing and rendering random circuits of increasing size:
+building the Netlist, stripsToPlace, connectedStrips, sequentialPinGroups, optimisePlacement and
+renderBoard. Writes one JSON object per circuit, so results from different
+releases can be compared.
+
+    python benchmarks/scaling.py --sizes 10 20 40 80 --output scaling.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from wadjet.core import (
+    stripsToPlace,
+    connectedStrips,
+    sequentialPinGroups,
+    placeBoard,
+    renderBoard,
+)
+from wadjet.netlist import Netlist
+from wadjet.optimise import optimisePlacement
+from wadjet.synthetic import randomCircuit
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmarkCircuit(num_components, seed, fan_out, time_limit, backend):
+    component_list, connections = randomCircuit(
+        num_components, seed=seed, fan_out=fan_out
+    )
+
+    seconds = {}
+
+    netlist, seconds["Netlist"] = timed(Netlist, component_list, connections)
+    strips, seconds["stripsToPlace"] = timed(stripsToPlace, netlist)
+    connected_pairs, seconds["connectedStrips"] = timed(connectedStrips, netlist)
+    sequential_groups, seconds["sequentialPinGroups"] = timed(
+        sequentialPinGroups, netlist
+    )
+    start = time.perf_counter()
+    try:
+        result, _ = timed(
+            optimisePlacement,
+            connected_pairs,
+            list(sequential_groups.values()),
+            time_limit=time_limit,
+        )
+    except RuntimeError:
+        # Nothing found within the time limit
+        result = None
+    seconds["optimisePlacement"] = time.perf_counter() - start
+
+    # Rendering does not depend on how good the placement is, so the fast
+    # heuristic is used to get one
+    placement, _ = timed(placeBoard, component_list, connections, engine="heuristic")
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = ("png",) if backend == "matplotlib" else ("svg",)
+        _, seconds["renderBoard"] = timed(
+            renderBoard,
+            placement,
+            name=os.path.join(tmp, "board"),
+            formats=formats,
+            backend=backend,
+        )
+
+    return {
+        "components": num_components,
+        "seed": seed,
+        "fan_out": fan_out,
+        "strips": len(strips),
+        "connected_pairs": len(connected_pairs),
+        "sequential_groups": len(sequential_groups),
+        "status": result.status if result is not None else "UNKNOWN",
+        "objective": result.objective if result is not None else None,
+        "bound": result.bound if result is not None else None,
+        "seconds": seconds,
+    }
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 40, 80])
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument(
+        "--backend", choices=("matplotlib", "svg"), default="matplotlib"
+    )
+    parser.add_argument("--output", default=None, help="JSON lines file to write")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output is not None else sys.stdout
+
+    environment = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time_limit": args.time_limit,
+        "backend": args.backend,
+    }
+
+    for num_components in args.sizes:
+        for seed in range(args.seeds):
+            record = benchmarkCircuit(
+                num_components, seed, args.fan_out, args.time_limit, args.backend
+            )
+            record.update(environment)
+            print(json.dumps(record, sort_keys=True), file=output, flush=True)
+
+    if output is not sys.stdout:
+        output.close()
@@ -0,0 +1,124 @@
+"""
+Times proving the optimal placement of each circuit in tests/test.py with and
+without symmetry breaking, with a single search worker so the timings are
+comparable.
+
+    python benchmarks/symmetry.py
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+import wadjet.core
+from wadjet.core import placeBoard
+from wadjet.optimise import optimisePlacement, symmetryBreakingPairs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+import test as circuits
+
+
+def circuitModels():
+    """
+    Runs each circuit test, placing instead of rendering, and returns the
+    placement models they solve as (name, connected_pairs, sequential_groups).
+    """
+
+    models = []
+    solve = wadjet.core.optimisePlacement
+
+    def record(connected_pairs, sequential_groups, **options):
+        sequential_groups = [list(group) for group in sequential_groups]
+        models.append((name, connected_pairs, sequential_groups))
+        return solve(connected_pairs, sequential_groups, **options)
+
+    wadjet.core.optimisePlacement = record
+    circuits.generateBoard = placeBoard
+
+    for name in ["testVCO", "testRectifier", "testCommonEmitterAmp", "testSquareWave"]:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                getattr(circuits, name)()
+        except RuntimeError:
+            # Not every circuit in the tests can be placed
+            pass
+
+    wadjet.core.optimisePlacement = solve
+
+    return models
+
+
+def parallelNetworks(k):
+    """
+    k identical networks between the same two nets, such as k decoupling
+    capacitors or pull-up resistors, plus a chain on either side. The k middle
+    strips are interchangeable.
+    """
+
+    connected_pairs = [(0, 1), (1, 2), (k + 3, k + 4)]
+    for i in range(3, k + 3):
+        connected_pairs += [(2, i), (i, k + 3)]
+    return (f"parallel x{k}", connected_pairs, [])
+
+
+def timeToOptimal(connected_pairs, sequential_groups, symmetry_breaking, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = optimisePlacement(
+                connected_pairs,
+                sequential_groups,
+                num_workers=1,
+                decompose=False,
+                symmetry_breaking=symmetry_breaking,
+                # Small models would otherwise be solved by exactPlacement,
+                # which has no symmetry breaking
+                encoding="interval",
+            )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result.objective
+
+
+if __name__ == "__main__":
+
+    repeats = 5
+
+    print(
+        f"{'circuit':>22} {'strips':>7} {'constraints':>12} "
+        f"{'plain s':>9} {'broken s':>9} {'speedup':>8}"
+    )
+
+    models = circuitModels() + [parallelNetworks(k) for k in (4, 5, 6)]
+
+    for name, connected_pairs, sequential_groups in models:
+        num_strips = (
+            max(
+                max((max(pair) for pair in connected_pairs), default=-1),
+                max((max(group) for group in sequential_groups if group), default=0),
+            )
+            + 1
+        )
+        num_pairs = len(
+            symmetryBreakingPairs(connected_pairs, sequential_groups, num_strips)
+        )
+
+        try:
+            plain, plain_objective = timeToOptimal(
+                connected_pairs, sequential_groups, False, repeats
+            )
+        except RuntimeError:
+            print(f"{name:>22} {num_strips:>7} {'infeasible':>12}")
+            continue
+        broken, broken_objective = timeToOptimal(
+            connected_pairs, sequential_groups, True, repeats
+        )
+        assert plain_objective == broken_objective
+
+        print(
+            f"{name:>22} {num_strips:>7} {num_pairs:>12} "
+            f"{plain:>9.4f} {broken:>9.4f} {plain / broken:>7.2f}x"
+        )
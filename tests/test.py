@@ -1,6 +1,39 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 
-from wadjet.core import generateBoard
+import numpy as np
+
+from wadjet.core import (
+    generateBoard,
+    generateBoards,
+    connectedStrips,
+    placeBoard,
+    renderBoard,
+    sequentialPinGroups,
+    stripsToPlace,
+)
+from wadjet.optimise import (
+    optimisePlacement,
+    connectedComponentStrips,
+    interchangeableStrips,
+    chooseEncoding,
+    exactPlacement,
+)
+from wadjet.heuristic import heuristicPlacement
+from wadjet.graphics import Stripboard, row_label
+from wadjet.cache import PlacementCache, netlistHash
+from wadjet.synthetic import randomCircuit
+from wadjet.instrument import Hooks
+from wadjet.netlist import Netlist
+from wadjet.packing import packStrips
+from wadjet.board import Board
+from wadjet.lns import lnsPlacement
+from wadjet.portfolio import PORTFOLIO, racePlacement
+from wadjet.aio import generateBoardAsync, placeBoardAsync
+from wadjet.cli import makeServer, netlistFromJSON, requestPlacement
 
 from wadjet.components import (
     Component,
@@ -11,6 +44,7 @@ from wadjet.components import (
     SchmittTrigger,
     PowerSupply,
     BJT,
+    Jumper,
 )
 
 
@@ -143,6 +177,889 @@ def testCommonEmitterAmp():
 
     board = generateBoard(component_list, connections)
 
+    heuristic_board = generateBoard(component_list, connections, engine="heuristic")
+    assert set(heuristic_board.legs_to_strips) == set(board.legs_to_strips)
+
+
+def testWarmStart():
+
+    connected_pairs = [(0, 1), (1, 2), (1, 3), (1, 4)]
+    sequential_groups = [(1, 3, 4)]
+
+    cold = optimisePlacement(connected_pairs, sequential_groups)
+    assert cold.hints_kept is None
+
+    hint = {strip: index for strip, index in enumerate(cold)}
+    warm = optimisePlacement(connected_pairs, sequential_groups, hint=hint)
+
+    assert warm.objective == cold.objective
+    assert 0.0 <= warm.hints_kept <= 1.0
+
+    # Groups sharing strips are modelled by position, and still take the hint
+    connected_pairs = [(2, 3), (2, 4), (3, 5), (4, 5), (5, 6)]
+    sequential_groups = [(0, 1), (1, 2)]
+    hint = {0: 0, 1: 1, 2: 2, 3: 4, 4: 3, 5: 5, 6: 6}
+    warm = optimisePlacement(
+        connected_pairs,
+        sequential_groups,
+        hint=hint,
+        num_workers=1,
+        symmetry_breaking=False,
+        encoding="interval",
+    )
+    assert warm.hints_kept == 1.0
+
+
+def testAnytimeSolve():
+
+    connected_pairs = [(i, j) for i in range(12) for j in range(i + 1, 12, 3)]
+    sequential_groups = [(0, 4, 8)]
+
+    improving = []
+    result = optimisePlacement(
+        connected_pairs,
+        sequential_groups,
+        time_limit=1.0,
+        num_workers=2,
+        callback=improving.append,
+    )
+
+    assert len(improving) > 0
+    assert result.objective <= min(r.objective for r in improving)
+    assert result.bound <= result.objective
+    assert result.gap >= 0.0
+    assert result.optimal == (result.gap == 0.0)
+
+    # Running out of time before any solution still gives a placement
+    connected_pairs = [(i, i + 1) for i in range(199)]
+    connected_pairs += [(i, (7 * i + 3) % 200) for i in range(200)]
+    result = optimisePlacement(connected_pairs, [], time_limit=0.01)
+    assert sorted(result) == list(range(200))
+    assert result.status == "FEASIBLE"
+
+    # Strips cannot follow each other in both directions
+    try:
+        optimisePlacement([(0, 1)], [(0, 1), (1, 0)])
+    except RuntimeError:
+        pass
+    else:
+        assert False
+
+
+def testConnectedComponentStrips(tmp_path):
+
+    connections = {
+        "Vcc": ["R1_in", "R2_in"],
+        "R1_out": ["junction"],
+        "junction": ["Q1_base", "R3_in"],
+        "R2_out": [],
+        "GND": ["R3_out", "Q1_emitter"],
+        "Q1_collector": ["R2_out"],
+    }
+
+    graph_file = tmp_path / "graph.graphml"
+    strips = connectedComponentStrips(connections, graph_file=str(graph_file))
+
+    assert strips == [
+        ["Vcc", "R1_in", "R2_in"],
+        ["R1_out", "junction", "Q1_base", "R3_in"],
+        ["GND", "R3_out", "Q1_emitter"],
+        ["Q1_collector", "R2_out"],
+    ]
+    assert graph_file.exists()
+
+
+def testConnectedStrips():
+
+    strips = [
+        ["R1_in", "Vcc"],
+        ["R1_out", "R2_in", "Q1_base"],
+        ["R2_out", "Q1_emitter", "GND"],
+        ["Q1_collector", "Vcc_V+"],
+    ]
+
+    assert connectedStrips(strips) == [(0, 1), (0, 3), (1, 2), (1, 3), (2, 3)]
+    assert connectedStrips(strips, multiplicity=True) == {
+        (0, 1): 1,
+        (0, 3): 1,
+        (1, 2): 2,
+        (1, 3): 1,
+        (2, 3): 1,
+    }
+
+    weighted = optimisePlacement(
+        connectedStrips(strips),
+        [],
+        weights=connectedStrips(strips, multiplicity=True),
+    )
+    assert weighted.objective == 8
+
+
+def testComponentLegTables():
+
+    U1 = OpAmp(name="U1", package_size=4)
+    U2 = OpAmp(name="U2", package_size=4)
+    R1 = Resistor(name="R1")
+
+    assert not hasattr(R1, "__dict__") and not hasattr(U1, "__dict__")
+
+    # Leg layouts are shared between ICs of the same type and size
+    assert U1.sequential_legs is U2.sequential_legs
+    assert U1.legs is U2.legs
+    assert U1.legs is not OpAmp(name="U3", package_size=2).legs
+
+    names = U1.unique_leg_names()
+    assert names is U1.unique_leg_names()
+    assert names[0][:2] == ("U1_-5V", "U1_non_inverting_input_1")
+    assert names[1][-1] == "U1_5V"
+    assert R1.unique_leg_names() == ("R1_in", "R1_out")
+
+    R1.name = "R2"
+    assert R1.unique_leg_names() == ("R2_in", "R2_out")
+
+
+def testNetlist():
+
+    ground = PowerSupply("GND1", "GND")
+    opamp = OpAmp(name="U1", package_size=2)
+    jumpers = [Jumper("jumper_0"), Jumper("jumper_1")]
+
+    connections = {
+        "GND1": ["jumper_0_start", "U1_output_1"],
+        "GND1_GND": ["jumper_1_start"],
+        "jumper_0_end": ["U1_inverting_input_1"],
+        "jumper_1_end": ["U1_5V"],
+    }
+
+    netlist = Netlist([ground, opamp] + jumpers, connections)
+
+    assert netlist.component_of("jumper_0_end") is jumpers[0]
+    assert netlist.component_of("GND1") is None
+    assert netlist.component_of("GND1_GND") is ground
+
+    strips = stripsToPlace(netlist)
+    assert strips[:4] == [
+        ["GND1", "jumper_0_start", "U1_output_1"],
+        ["GND1_GND", "jumper_1_start"],
+        ["jumper_0_end", "U1_inverting_input_1"],
+        ["jumper_1_end", "U1_5V"],
+    ]
+
+    # The jumpers are separate components, and GND1 is not the GND1 supply
+    pairs = connectedStrips(netlist, multiplicity=True)
+    assert pairs[(0, 2)] == 2 and pairs[(1, 3)] == 1
+    assert (0, 1) not in pairs and (1, 2) not in pairs
+
+    legacy_pairs = connectedStrips(strips, multiplicity=True)
+    assert (0, 1) in legacy_pairs and (1, 2) in legacy_pairs
+
+    assert (
+        sequentialPinGroups(netlist)["U1"]
+        == sequentialPinGroups([ground, opamp] + jumpers, strips)["U1"]
+    )
+
+
+def testJumperInsertion():
+    opamp = OpAmp(name="U1", package_size=2)
+    resistor = Resistor(name="R1")
+    component_list = [opamp, resistor]
+
+    # Three pins of U1 on one net, and two on another
+    connections = {
+        "R1_in": ["U1_output_1", "U1_inverting_input_1", "U1_5V"],
+        "R1_out": ["U1_output_2", "U1_inverting_input_2"],
+    }
+    original = {pin: list(pins) for pin, pins in connections.items()}
+
+    netlist = Netlist(component_list, connections)
+    num_strips = netlist.num_strips
+    jumper_names = netlist.insert_jumpers()
+
+    assert jumper_names == [
+        "jumper_U1_output_1_U1_inverting_input_1",
+        "jumper_U1_output_1_U1_5V",
+        "jumper_U1_output_2_U1_inverting_input_2",
+    ]
+    assert netlist.num_strips == num_strips + 3
+
+    strips = stripsToPlace(netlist)
+    assert ["U1_inverting_input_1", f"{jumper_names[0]}_end"] in strips
+    assert f"{jumper_names[0]}_start" in strips[netlist.pin_strip[0]]
+
+    # Every pin of the IC is now on a strip of its own
+    group = sequentialPinGroups(netlist)["U1"]
+    assert len(group) == len(set(group))
+
+    placement = placeBoard(component_list, connections)
+    assert connections == original
+    assert component_list == [opamp, resistor]
+    for name in jumper_names:
+        assert name in placement.component_columns
+
+    # Pins of different ICs on one supply net are split up too
+    U1 = OpAmp(name="U1", package_size=2)
+    U2 = OpAmp(name="U2", package_size=2)
+    Vcc = PowerSupply(name="V1", voltage_level="5V")
+    component_list = [U1, U2, Vcc]
+    connections = {"V1_V+": ["U1_5V", "U2_5V"]}
+
+    netlist = Netlist(component_list, connections)
+    assert netlist.insert_jumpers() == ["jumper_U1_5V_U2_5V"]
+    groups = sequentialPinGroups(netlist).values()
+    grouped = [strip for group in groups for strip in group]
+    assert len(grouped) == len(set(grouped))
+
+    for engine in ("cp-sat", "heuristic"):
+        placement = placeBoard(component_list, connections, engine=engine)
+        assert "jumper_U1_5V_U2_5V" in placement.component_columns
+
+
+def testStripPacking(tmp_path):
+    first = np.array([0, 3, 1, 6, -1, 2])
+    last = np.array([1, 4, 2, 8, -1, 9])
+
+    row_of_strip, num_rows, cuts = packStrips(first, last)
+    assert num_rows == 4
+    assert row_of_strip[0] == row_of_strip[1] and row_of_strip[2] == row_of_strip[3]
+    assert sorted(cuts) == sorted([(2, row_of_strip[0]), (3, row_of_strip[2])])
+
+    # No row has two exclusive strips
+    exclusive = np.array([True, True, False, False, False, False])
+    row_of_strip, num_rows, cuts = packStrips(first, last, exclusive)
+    assert row_of_strip[0] != row_of_strip[1]
+
+    # A chain of resistors needs three rows, whatever its length
+    n = 10
+    component_list = [Resistor(name=f"R{i}") for i in range(n)]
+    connections = {f"R{i}_out": [f"R{i + 1}_in"] for i in range(n - 1)}
+    connections["R0_in"] = ["R0_in"]
+    connections[f"R{n - 1}_out"] = [f"R{n - 1}_out"]
+
+    unpacked = placeBoard(component_list, connections, pack=False)
+    placement = placeBoard(component_list, connections)
+    assert unpacked.num_rows == n + 1 and len(unpacked.cuts) == 0
+    assert placement.num_rows < unpacked.num_rows
+
+    # Each cut separates the legs of different nets on its row
+    columns = {
+        leg: placement.component_columns[name]
+        for name, legs in placement.component_legs.items()
+        for leg in legs
+    }
+    for i in range(n - 1):
+        row = placement.legs_to_strips[f"R{i}_out"]
+        net = (columns[f"R{i}_out"], columns[f"R{i + 1}_in"])
+        assert placement.legs_to_strips[f"R{i + 1}_in"] == row
+        for column, cut_row in placement.cuts:
+            if cut_row == row:
+                assert not min(net) <= column <= max(net)
+
+    board = renderBoard(placement, name=str(tmp_path / "chain"), backend="svg")
+    assert len(board._breaks) == len(placement.cuts)
+
+
+def testBoardGrid():
+    board = Board(6, 5)
+    board.add_component("R1", 0, [0, 3])
+    board.add_ic("U1", 2, 1, 3)
+    board.add_cut(5, 2)
+
+    assert board.component_at(0, 3) == "R1" and board.component_at(0, 1) is None
+    assert board.component_at(3, 2) == "U1"
+    assert board.used_area() == (6, 4, 2 + 6 + 1)
+    assert board.collisions() == []
+
+    assert board.is_free(0, 1, num_rows=2)
+    assert not board.is_free(0, 1, num_rows=3)
+    assert not board.is_free(5, 4, num_columns=2)
+    assert board.used_holes() == 9 and board.used_holes(2, 1, 2, 3) == 6
+
+    # Corners of free two by two blocks
+    spans = board.free_spans(num_columns=2, num_rows=2)
+    assert spans.shape == (4, 5)
+    assert spans[1, 0] and spans[3, 4] and not spans[3, 0] and not spans[1, 1]
+
+    board.add_component("R2", 3, [3, 4])
+    board.add_component("R3", 5, [2])
+    assert board.collisions() == [(5, 2), (3, 3)]
+    assert board.component_at(3, 3) == "U1"
+
+    placement = placeBoard(*randomCircuit(12, seed=1))
+    assert placement.board.collisions() == []
+    num_columns, num_rows, _ = placement.board.used_area()
+    assert num_columns == placement.board.num_columns == placement.num_columns
+    assert placement.board.num_rows >= placement.num_rows
+
+    # An IC uses the holes of every row its pins are on
+    U1 = SchmittTrigger(name="U1", package_size=6)
+    R1 = Resistor(name="R1")
+    placement = placeBoard([U1, R1], {"R1_in": ["U1_GND"], "R1_out": ["U1_5V"]})
+    x = placement.ic_positions["U1"][0]
+    for leg in placement.ic_legs["U1"]:
+        if leg in placement.legs_to_strips:
+            row = placement.legs_to_strips[leg]
+            assert placement.board.component_at(x, row) == "U1"
+            assert not placement.board.is_free(x, row)
+
+
+def testPortfolioPlacement():
+    component_list, connections = randomCircuit(10, seed=2)
+
+    exact = placeBoard(component_list, connections)
+    raced = placeBoard(component_list, connections, engine="portfolio", time_limit=10)
+    assert raced.statistics["status"] == "OPTIMAL"
+    assert raced.statistics["objective"] == exact.statistics["objective"]
+    assert raced.statistics["engine"] in [name for name, _, _ in PORTFOLIO]
+    assert set(raced.solve.portfolio) == {name for name, _, _ in PORTFOLIO}
+
+    # A failing strategy is reported, and the others carry on
+    result = racePlacement(
+        [(0, 1), (1, 2), (0, 2)],
+        [[0]],
+        deadline=10,
+        strategies=[("bad", "simplex", {}), ("heuristic", "heuristic", {})],
+    )
+    assert result.engine == "heuristic"
+    assert "Unknown placement engine" in result.portfolio["bad"]["error"]
+
+    # Whatever is best at the deadline is returned
+    start = time.perf_counter()
+    placement = placeBoard(*randomCircuit(80, seed=2), engine="portfolio", time_limit=1)
+    assert time.perf_counter() - start < 5
+    assert placement.statistics["objective"] is not None
+
+
+def testLNSPlacement():
+
+    # A chain of strips, with a group, placed in a poor order to start from
+    connected_pairs = [(i, i + 1) for i in range(29)] + [(0, 29), (3, 17)]
+    sequential_groups = [(10, 11, 12)]
+    rng = np.random.default_rng(0)
+    order = [i for i in rng.permutation(30).tolist() if i not in (11, 12)]
+    order.insert(order.index(10) + 1, 11)
+    order.insert(order.index(10) + 2, 12)
+    initial = [order.index(i) for i in range(30)]
+
+    objectives = []
+    result = lnsPlacement(
+        connected_pairs,
+        sequential_groups,
+        initial=initial,
+        max_iterations=20,
+        callback=lambda r: objectives.append(r.objective),
+    )
+
+    placements = result.placements
+    assert sorted(placements) == list(range(30))
+    assert placements[11] == placements[10] + 1 and placements[12] == placements[11] + 1
+    assert result.objective == sum(
+        abs(placements[s1] - placements[s2]) for s1, s2 in connected_pairs
+    )
+    initial_objective = sum(
+        abs(initial[s1] - initial[s2]) for s1, s2 in connected_pairs
+    )
+    assert len(objectives) > 0 and result.objective < initial_objective
+    assert objectives == sorted(objectives, reverse=True)
+
+    placement = placeBoard(*randomCircuit(40, seed=1), engine="lns", time_limit=2)
+    assert placement.statistics["objective"] is not None
+
+
+def testDecomposedPlacement():
+
+    # Two separate chains, and an IC-like group joining strips 6 and 7
+    connected_pairs = [(0, 1), (1, 2), (2, 3), (4, 5), (5, 6), (3, 0)]
+    sequential_groups = [(6, 7)]
+
+    decomposed = optimisePlacement(connected_pairs, sequential_groups)
+    monolithic = optimisePlacement(connected_pairs, sequential_groups, decompose=False)
+
+    assert decomposed.objective == monolithic.objective
+    assert sorted(decomposed) == list(range(8))
+    assert decomposed[7] == decomposed[6] + 1
+    assert max(decomposed[i] for i in range(4)) < min(
+        decomposed[i] for i in range(4, 8)
+    )
+
+    # The callback is given full placements, not those of each block
+    improving = []
+    result = optimisePlacement(
+        connected_pairs,
+        sequential_groups,
+        encoding="interval",
+        num_workers=2,
+        callback=improving.append,
+    )
+    assert len(improving) > 0
+    for solution in improving:
+        assert sorted(solution) == list(range(8))
+        assert solution.objective == sum(
+            abs(solution[s1] - solution[s2]) for s1, s2 in connected_pairs
+        )
+    assert improving[-1].objective == result.objective
+
+    # The blocks share one time limit, even when they are solved in turn
+    rng = np.random.default_rng(0)
+    connected_pairs = []
+    for first in range(0, 120, 30):
+        connected_pairs += [(first + i, first + i + 1) for i in range(29)]
+        connected_pairs += (first + rng.integers(0, 30, size=(40, 2))).tolist()
+    connected_pairs = [(s1, s2) for s1, s2 in connected_pairs if s1 != s2]
+
+    start = time.perf_counter()
+    result = optimisePlacement(connected_pairs, [], time_limit=0.5, num_workers=1)
+    assert time.perf_counter() - start < 1.0
+    assert sorted(result) == list(range(120))
+
+
+def testSymmetryBreaking():
+
+    # Strips 3, 4 and 5 all join strips 2 and 6, so they can be permuted freely
+    connected_pairs = [(0, 1), (1, 2), (2, 3), (2, 4), (2, 5), (3, 6), (4, 6), (5, 6)]
+
+    assert interchangeableStrips(connected_pairs, [], 7) == [[3, 4, 5]]
+    assert interchangeableStrips(connected_pairs, [(3, 4)], 7) == []
+
+    plain = optimisePlacement(
+        connected_pairs, [], symmetry_breaking=False, encoding="interval"
+    )
+    broken = optimisePlacement(connected_pairs, [], encoding="interval")
+    assert broken.objective == plain.objective
+    assert broken[3] < broken[4] < broken[5]
+    assert broken[0] < broken[6]
+
+    # The hinted order of interchangeable strips is kept
+    hint = {strip: index for strip, index in enumerate(broken)}
+    hint[3], hint[5] = hint[5], hint[3]
+    warm = optimisePlacement(connected_pairs, [], hint=hint, encoding="interval")
+    assert warm[5] < warm[4] < warm[3]
+    assert warm.hints_kept == 1.0
+
+
+def testExactPlacement():
+
+    connected_pairs = [(i, j) for i in range(12) for j in range(i + 1, 12, 5)]
+    sequential_groups = [(0, 6, 11), (3, 2)]
+    weights = {(0, 5): 3, (4, 9): 2}
+
+    exact = optimisePlacement(connected_pairs, sequential_groups, weights=weights)
+    model = optimisePlacement(
+        connected_pairs, sequential_groups, weights=weights, encoding="interval"
+    )
+    assert exact.optimal and exact.branches is None
+    assert exact.objective == exact.bound == model.objective
+
+    placements = exact.placements
+    assert sorted(placements) == list(range(12))
+    assert placements[6] == placements[0] + 1 and placements[11] == placements[6] + 1
+    assert placements[2] == placements[3] + 1
+    assert exact.objective == sum(
+        weights.get((s1, s2), 1) * abs(placements[s1] - placements[s2])
+        for s1, s2 in connected_pairs
+    )
+
+    # Of the optimal placements, the hinted one is kept
+    hint = {strip: index for strip, index in enumerate(model)}
+    warm = exactPlacement(
+        connected_pairs, sequential_groups, weights=weights, hint=hint
+    )
+    assert warm.placements == model.placements
+    assert warm.hints_kept == 1.0
+
+    try:
+        exactPlacement(connected_pairs, [(0, 1), (1, 2)])
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def testPlacementEncodings():
+
+    connected_pairs = [(i, j) for i in range(10) for j in range(i + 1, 10, 4)]
+    sequential_groups = [(0, 5, 9), (2, 3)]
+
+    objectives = set()
+    for encoding in ("position", "interval", "ordering"):
+        result = optimisePlacement(
+            connected_pairs, sequential_groups, encoding=encoding
+        )
+        assert result[5] == result[0] + 1 and result[9] == result[5] + 1
+        objectives.add(result.objective)
+    assert len(objectives) == 1
+
+    chain = [(i, i + 1) for i in range(29)]
+    assert chooseEncoding(chain, sequential_groups, 30) == "interval"
+    dense = [(i, j) for i in range(20) for j in range(i + 1, 20, 3)]
+    assert chooseEncoding(dense, [], 20) == "ordering"
+
+    try:
+        optimisePlacement(connected_pairs, sequential_groups, encoding="boolean")
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def testHeuristicPlacement():
+
+    connected_pairs = [(i, j) for i in range(10) for j in range(i + 1, 10, 3)]
+    sequential_groups = [(0, 4, 8), (5, 2)]
+
+    exact = optimisePlacement(connected_pairs, sequential_groups)
+    heuristic = heuristicPlacement(connected_pairs, sequential_groups)
+
+    placements = heuristic.placements
+    assert sorted(placements) == list(range(10))
+    assert placements[4] == placements[0] + 1 and placements[8] == placements[4] + 1
+    assert placements[2] == placements[5] + 1
+
+    assert heuristic.objective == sum(
+        abs(placements[s1] - placements[s2]) for s1, s2 in connected_pairs
+    )
+    assert exact.objective <= heuristic.objective <= 1.25 * exact.objective
+
+
+def testRegenerateWithPrevious():
+
+    R1 = Resistor(name="R1")
+    R2 = Resistor(name="R2")
+    Vcc = PowerSupply(name="Vcc", voltage_level="5V")
+    GND = PowerSupply(name="GND", voltage_level="GND")
+
+    component_list = [R1, R2, Vcc, GND]
+    connections = {"Vcc": ["R1_in"], "R1_out": ["R2_in"], "GND": ["R2_out"]}
+
+    board = generateBoard(component_list, connections)
+    regenerated = generateBoard(
+        component_list, connections, previous=board.legs_to_strips
+    )
+
+    assert regenerated.hints_kept is not None
+    assert set(regenerated.legs_to_strips) == set(board.legs_to_strips)
+
+
+def testPlaceThenRender(tmp_path):
+
+    opamp = OpAmp(name="U1", package_size=2)
+    R1 = Resistor(name="R1")
+    R2 = Resistor(name="R2")
+
+    component_list = [opamp, R1, R2]
+    connections = {
+        "R1_out": ["U1_inverting_input_1", "R2_in"],
+        "R2_out": ["U1_output_1"],
+        "R1_in": ["U1_non_inverting_input_1"],
+    }
+
+    placement = placeBoard(component_list, connections)
+
+    assert placement.component_columns == {"R1": 0, "R2": 1}
+    assert list(placement.ic_positions) == ["U1"]
+    assert placement.ic_positions["U1"][0] == 3
+    assert placement.num_rows == len(placement.strips)
+    assert placement.legs_to_strips["R1_out"] == placement.legs_to_strips["R2_in"]
+
+    renderBoard(placement, name=str(tmp_path / "board"), formats=("png",))
+    assert (tmp_path / "board.png").exists()
+    assert not (tmp_path / "board.pdf").exists()
+
+
+def testSVGRender(tmp_path):
+
+    opamp = OpAmp(name="U1", package_size=2)
+    R1 = Resistor(name="R1")
+    R2 = Resistor(name="R2")
+
+    component_list = [opamp, R1, R2]
+    connections = {
+        "R1_out": ["U1_inverting_input_1", "R2_in"],
+        "R2_out": ["U1_output_1"],
+        "R1_in": ["U1_non_inverting_input_1"],
+    }
+
+    placement = placeBoard(component_list, connections)
+
+    renderBoard(placement, name=str(tmp_path / "a"), backend="svg")
+    renderBoard(placement, name=str(tmp_path / "b"), backend="svg")
+
+    for file_format in ("svg", "txt"):
+        a = (tmp_path / f"a.{file_format}").read_bytes()
+        assert a == (tmp_path / f"b.{file_format}").read_bytes()
+
+    svg = (tmp_path / "a.svg").read_text()
+    assert svg.startswith("<svg") and svg.count("<line") == 2 + 1
+
+    # The board is just large enough for the placement
+    size = max(placement.board.num_columns, placement.board.num_rows)
+    text = (tmp_path / "a.txt").read_text().splitlines()
+    assert text[0].split() == [str(x) for x in range(1, size + 1)]
+    assert "R1: 1" in "\n".join(text) and "U1: IC at 4" in text[-1]
+
+    try:
+        renderBoard(placement, str(tmp_path / "c"), formats=("pdf",), backend="svg")
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def testRandomCircuit():
+
+    component_list, connections = randomCircuit(30, seed=3, fan_out=4)
+    assert connections == randomCircuit(30, seed=3, fan_out=4)[1]
+    assert connections != randomCircuit(30, seed=4, fan_out=4)[1]
+
+    ic_pins = set()
+    for component in component_list:
+        if component.ic:
+            ic_pins.update(sum(component.unique_leg_names(), ()))
+
+    for pin, pins in connections.items():
+        net = [pin] + pins
+        assert len(net) >= 2
+        assert len([p for p in net if p in ic_pins]) <= 1
+        assert len({p.split("_")[0] for p in net}) == len(net)
+
+    placement = placeBoard(component_list, connections, engine="heuristic")
+    for component in component_list:
+        if not component.ic:
+            for leg in component.unique_leg_names():
+                assert leg in placement.legs_to_strips
+
+
+def testLargeStripboard(tmp_path):
+
+    assert [row_label(y) for y in (0, 25, 26, 27, 51, 52)] == [
+        "A",
+        "Z",
+        "AA",
+        "AB",
+        "AZ",
+        "BA",
+    ]
+
+    board = Stripboard(40)
+    for x in range(40):
+        board.add_component((x, x % 7), (x, 30 + x % 9), name=f"R{x}")
+    board.add_ic((20, 10), 8, name="U1")
+
+    board.savefig(tmp_path / "board.png")
+
+    # Holes and strips are one collection each, whatever the size
+    assert len(board.ax.patches) == 0
+    assert len(board.ax.collections) == 6
+
+
+def testPlacementCache(tmp_path):
+
+    component_list = [Resistor(name="R1"), Resistor(name="R2")]
+    connections = {"R1_out": ["R2_in"], "R1_in": ["R2_out"]}
+    reordered = {"R2_out": ["R1_in"], "R2_in": ["R1_out"]}
+
+    assert netlistHash(component_list, connections) == netlistHash(
+        component_list[::-1], reordered
+    )
+
+    cache = PlacementCache(tmp_path, max_entries=1)
+
+    board = generateBoard(component_list, connections, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    cached_board = generateBoard(component_list, reordered, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_board.legs_to_strips == board.legs_to_strips
+
+    generateBoard(
+        [Resistor(name="R3"), Resistor(name="R4")],
+        {"R3_out": ["R4_in"], "R3_in": ["R4_out"]},
+        cache=cache,
+    )
+    assert len(cache) == 1
+
+    # Packed rows depend on the order of the components, which give their
+    # columns, so reordering them is a miss
+    chain = [Resistor(name=f"R{i}") for i in range(1, 7)]
+    connections = {f"R{i}_out": [f"R{i + 1}_in"] for i in range(1, 6)}
+    cache = PlacementCache(tmp_path / "packed")
+
+    placeBoard(chain, connections, cache=cache)
+    placement = placeBoard(chain[::-1], connections, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert placement.board.collisions() == []
+
+    placeBoard(chain, connections, cache=cache, pack=False)
+    placeBoard(chain[::-1], connections, cache=cache, pack=False)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def testInstrumentation(tmp_path, monkeypatch):
+    class RecordingHooks(Hooks):
+        def __init__(self):
+            self.stages = []
+            self.solves = []
+
+        def on_stage(self, name, seconds):
+            self.stages.append(name)
+
+        def on_solve(self, statistics):
+            self.solves.append(statistics)
+
+    component_list, connections = randomCircuit(8, seed=1)
+
+    hooks = RecordingHooks()
+    monkeypatch.chdir(tmp_path)
+    board = generateBoard(
+        component_list, connections, name=str(tmp_path / "board"), hooks=hooks
+    )
+
+    # The connection graph is only drawn when asked for
+    assert not (tmp_path / "circuit_graph.pdf").exists()
+
+    for stage in ("connectivity", "jumpers", "solve", "layout", "draw"):
+        assert stage in board.timings and stage in hooks.stages
+    assert "savefig_pdf" in board.timings and "savefig_png" in board.timings
+    assert all(seconds >= 0 for seconds in board.timings.values())
+
+    assert hooks.solves == [board.statistics]
+    assert board.statistics["status"] == "OPTIMAL"
+    # Boards this small are solved exactly without CP-SAT, so have no search
+    # statistics
+    assert board.statistics["branches"] is None
+    assert board.statistics["objective"] == board.statistics["bound"]
+
+
+def testAsyncGenerateBoard(tmp_path):
+    async def generate_concurrently():
+        return await asyncio.gather(
+            *[
+                generateBoardAsync(
+                    *randomCircuit(8, seed=seed),
+                    name=str(tmp_path / f"board_{seed}"),
+                    backend="svg",
+                    deadline=60,
+                )
+                for seed in range(3)
+            ]
+        )
+
+    boards = asyncio.run(generate_concurrently())
+    assert [board.statistics["status"] for board in boards] == ["OPTIMAL"] * 3
+    assert (tmp_path / "board_2.svg").exists()
+
+    # Both missing the deadline and cancelling stop the solve in its thread
+    async def place(executor, deadline=None, cancel_after=None):
+        task = asyncio.create_task(
+            placeBoardAsync(
+                *randomCircuit(60, seed=2),
+                deadline=deadline,
+                solve_fraction=10,
+                time_limit=60,
+                executor=executor,
+            )
+        )
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            task.cancel()
+        await task
+
+    for deadline, cancel_after, error in (
+        (0.5, None, asyncio.TimeoutError),
+        (None, 0.5, asyncio.CancelledError),
+    ):
+        executor = ThreadPoolExecutor(max_workers=1)
+        start = time.perf_counter()
+        try:
+            asyncio.run(place(executor, deadline, cancel_after))
+        except error:
+            pass
+        else:
+            assert False
+        executor.shutdown(wait=True)
+        assert time.perf_counter() - start < 10
+
+
+def testPlacementServer(tmp_path):
+    netlist = {
+        "components": [
+            {"type": "Resistor", "name": "R1"},
+            {"type": "Resistor", "name": "R2"},
+            {"type": "OpAmp", "name": "U1", "package_size": 2},
+        ],
+        "connections": {
+            "R1_out": ["U1_inverting_input_1", "R2_in"],
+            "R2_out": ["U1_output_1"],
+            "R1_in": ["U1_non_inverting_input_1"],
+        },
+    }
+
+    component_list, connections = netlistFromJSON(netlist)
+    assert [c.name for c in component_list] == ["R1", "R2", "U1"]
+    assert component_list[2].package_size == 2
+
+    try:
+        netlistFromJSON({"components": [{"type": "Stripboard", "name": "X"}]})
+    except ValueError:
+        pass
+    else:
+        assert False
+
+    socket_path = str(tmp_path / "wadjet.sock")
+    render = {"name": str(tmp_path / "served"), "backend": "svg"}
+
+    # Without a server, the placement is made in process
+    response = requestPlacement(netlist, render=render, socket_path=socket_path)
+    assert response["ok"]
+    in_process = response["placement"]["legs_to_strips"]
+
+    server = makeServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        response = requestPlacement(
+            netlist, render=render, socket_path=socket_path, fallback=False
+        )
+        assert response["ok"]
+        assert response["placement"]["legs_to_strips"] == in_process
+        assert response["files"] == [
+            str(tmp_path / "served.svg"),
+            str(tmp_path / "served.txt"),
+        ]
+        assert (tmp_path / "served.svg").exists()
+
+        response = requestPlacement(
+            {"components": [{"type": "X"}]}, socket_path=socket_path
+        )
+        assert not response["ok"]
+        assert "ValueError" in response["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def testGenerateBoards(tmp_path):
+    def divider(n):
+        component_list = [Resistor(name=f"R{i}") for i in range(n)]
+        connections = {f"R{i}_out": [f"R{i + 1}_in"] for i in range(n - 1)}
+        connections[f"R{n - 1}_out"] = ["R0_in"]
+        return component_list, connections
+
+    jobs = [divider(n) + (str(tmp_path / f"divider_{n}"),) for n in (2, 3, 4)]
+    # A job without connections fails on its own
+    jobs.append(([Resistor(name="R0")], None, str(tmp_path / "bad")))
+
+    results = {name: (p, error) for name, p, error in generateBoards(jobs)}
+
+    assert len(results) == 4
+    assert results[str(tmp_path / "bad")][1] is not None
+
+    for n in (2, 3, 4):
+        placement, error = results[str(tmp_path / f"divider_{n}")]
+        assert error is None
+        assert len(set(placement.legs_to_strips.values())) == n
+        assert (tmp_path / f"divider_{n}.png").exists()
+
 
 def testSquareWave():
     class TimerIC(Component):
@@ -0,0 +1,111 @@
+import asyncio
+import functools
+import threading
+
+from wadjet.core import placeBoard, renderBoard
+from wadjet.optimise import Cancellation
+
+# pyplot keeps global state, so matplotlib renders run one at a time
+_render_lock = threading.Lock()
+
+
+async def _runInExecutor(function, cancellation, executor, timeout):
+    """
+    Runs function in executor and waits up to timeout seconds for it. If the
+    wait is cancelled or times out, cancellation is cancelled so the solve
+    stops rather than running on unobserved in its thread.
+    """
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, function)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        cancellation.cancel()
+        raise
+
+
+def _solveTimeLimit(time_limit, deadline, solve_fraction):
+    if deadline is None:
+        return time_limit
+    budget = deadline * solve_fraction
+    return budget if time_limit is None else min(time_limit, budget)
+
+
+async def placeBoardAsync(
+    component_list,
+    connections,
+    deadline=None,
+    solve_fraction=0.9,
+    executor=None,
+    **options,
+):
+    """
+    Like placeBoard, but runs in executor so the event loop is not blocked.
+    asyncio.TimeoutError is raised after deadline seconds, of which the solve
+    gets solve_fraction as its time limit.
+    """
+
+    cancellation = Cancellation()
+    options["time_limit"] = _solveTimeLimit(
+        options.get("time_limit"), deadline, solve_fraction
+    )
+
+    function = functools.partial(
+        placeBoard,
+        component_list,
+        connections,
+        cancellation=cancellation,
+        **options,
+    )
+
+    return await _runInExecutor(function, cancellation, executor, deadline)
+
+
+async def generateBoardAsync(
+    component_list,
+    connections,
+    name="board",
+    deadline=None,
+    solve_fraction=0.5,
+    executor=None,
+    formats=None,
+    backend="matplotlib",
+    **options,
+):
+    """
+    Like generateBoard, but runs in executor so the event loop is not blocked,
+    with a deadline as for placeBoardAsync. Matplotlib renders run one at a
+    time, as pyplot is not thread safe.
+    """
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    placement = await placeBoardAsync(
+        component_list,
+        connections,
+        deadline=deadline,
+        solve_fraction=solve_fraction,
+        executor=executor,
+        **options,
+    )
+
+    def render():
+        if backend == "matplotlib":
+            with _render_lock:
+                return renderBoard(
+                    placement, name=name, formats=formats, backend=backend
+                )
+        return renderBoard(placement, name=name, formats=formats, backend=backend)
+
+    remaining = None if deadline is None else max(0, deadline - (loop.time() - start))
+    board = await _runInExecutor(render, Cancellation(), executor, remaining)
+
+    board.placement = placement
+    board.legs_to_strips = placement.legs_to_strips
+    board.hints_kept = placement.hints_kept
+    board.timings = {**placement.timings, **board.timings}
+    board.statistics = placement.statistics
+
+    return board
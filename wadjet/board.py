@@ -0,0 +1,206 @@
+import numpy as np
+
+# Values of holes in Board.grid that hold no component
+EMPTY = -1
+CUT = -2
+
+
+class Board:
+    """
+    Occupancy grid of a stripboard with num_rows strips of num_columns holes,
+    holding the id of the component in each hole, EMPTY or CUT. Holes claimed
+    more than once are collisions, and block queries use a summed-area table.
+    """
+
+    def __init__(self, num_columns, num_rows):
+        self.grid = np.full((num_rows, num_columns), EMPTY, dtype=np.int32)
+        self.claims = np.zeros((num_rows, num_columns), dtype=np.int32)
+        self.names = []
+        self.ids = {}
+        self._table = None
+
+    @classmethod
+    def from_placement(cls, placement):
+        """
+        Returns the Board of a Placement, just large enough for its components
+        and rows.
+        """
+
+        rows = placement.legs_to_strips
+
+        board = cls(placement.num_columns, placement.num_rows)
+
+        # All legs are claimed at once, so that large boards are built quickly
+        values, leg_rows, leg_columns = [], [], []
+        for name, legs in placement.component_legs.items():
+            component_id = board._id(name)
+            column = placement.component_columns[name]
+            for leg in legs:
+                if leg in rows:
+                    values.append(component_id)
+                    leg_rows.append(rows[leg])
+                    leg_columns.append(column)
+        board._claim(values, leg_rows, leg_columns)
+
+        # An IC covers its two columns over the rows its legs are on
+        for name, (x, _, _) in placement.ic_positions.items():
+            ic_rows = [
+                rows[leg] for leg in placement.ic_legs.get(name, ()) if leg in rows
+            ]
+            if len(ic_rows) > 0:
+                first = min(ic_rows)
+                board.add_ic(name, x, first, max(ic_rows) - first + 1)
+        if len(placement.cuts) > 0:
+            cut_columns, cut_rows = zip(*placement.cuts)
+            board._claim(CUT, cut_rows, cut_columns)
+
+        return board
+
+    @property
+    def num_columns(self):
+        return self.grid.shape[1]
+
+    @property
+    def num_rows(self):
+        return self.grid.shape[0]
+
+    def __repr__(self):
+        return f"Board({self.num_columns} columns, {self.num_rows} rows)"
+
+    def _id(self, name):
+        component_id = self.ids.get(name)
+        if component_id is None:
+            component_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return component_id
+
+    def _claim(self, values, rows, columns):
+        """
+        Claims the holes at rows and columns for values (a value for each, or
+        one for all), ignoring holes off the board. A hole that is already used
+        keeps its value, as does the first of several claims on a free hole.
+        """
+
+        rows = np.asarray(rows, dtype=np.intp).ravel()
+        columns = np.asarray(columns, dtype=np.intp).ravel()
+        values = np.broadcast_to(np.asarray(values, dtype=np.int32), rows.shape)
+        on_board = (
+            (rows >= 0)
+            & (rows < self.num_rows)
+            & (columns >= 0)
+            & (columns < self.num_columns)
+        )
+        rows, columns, values = rows[on_board], columns[on_board], values[on_board]
+
+        holes = rows * self.num_columns + columns
+        np.add.at(self.claims.reshape(-1), holes, 1)
+
+        holes, first = np.unique(holes, return_index=True)
+        grid = self.grid.reshape(-1)
+        empty = grid[holes] == EMPTY
+        grid[holes[empty]] = values[first[empty]]
+        self._table = None
+
+    def add_component(self, name, column, rows):
+        """
+        Adds a component in column with a leg on each of rows.
+        """
+
+        rows = np.asarray(rows, dtype=np.intp)
+        self._claim(self._id(name), rows, np.full(len(rows), column))
+
+    def add_ic(self, name, column, row, num_rows):
+        """
+        Adds an IC two holes wide and num_rows long, with its corner at column
+        and row.
+        """
+
+        rows, columns = np.mgrid[row : row + num_rows, column : column + 2]
+        self._claim(self._id(name), rows, columns)
+
+    def add_cut(self, column, row):
+        self._claim(CUT, [row], [column])
+
+    def collisions(self):
+        """
+        Returns the (column, row) of each hole claimed more than once, by row.
+        """
+
+        rows, columns = np.nonzero(self.claims > 1)
+        return list(zip(columns.tolist(), rows.tolist()))
+
+    def component_at(self, column, row):
+        """
+        Returns the name of the component using a hole, or None.
+        """
+
+        value = self.grid[row, column]
+        return self.names[value] if value >= 0 else None
+
+    def _summed_area(self):
+        if self._table is None:
+            table = np.zeros((self.num_rows + 1, self.num_columns + 1), dtype=np.int64)
+            np.cumsum(np.cumsum(self.grid != EMPTY, axis=0), axis=1, out=table[1:, 1:])
+            self._table = table
+        return self._table
+
+    def used_holes(self, column=0, row=0, num_columns=None, num_rows=None):
+        """
+        Returns the number of used holes in the block of num_columns by
+        num_rows holes (the rest of the board if None) from column and row.
+        """
+
+        if num_columns is None:
+            num_columns = self.num_columns - column
+        if num_rows is None:
+            num_rows = self.num_rows - row
+
+        table = self._summed_area()
+        r0, c0 = row, column
+        r1, c1 = row + num_rows, column + num_columns
+        return int(table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0])
+
+    def is_free(self, column, row, num_columns=1, num_rows=1):
+        """
+        Returns whether the block of num_columns by num_rows holes from column
+        and row is on the board and unused.
+        """
+
+        if (
+            column < 0
+            or row < 0
+            or column + num_columns > self.num_columns
+            or row + num_rows > self.num_rows
+        ):
+            return False
+        return self.used_holes(column, row, num_columns, num_rows) == 0
+
+    def free_spans(self, num_columns=1, num_rows=1):
+        """
+        Returns a boolean array indexed by [row, column] of the corners where a
+        block of num_columns by num_rows holes is entirely unused.
+        """
+
+        table = self._summed_area()
+        used = (
+            table[num_rows:, num_columns:]
+            - table[:-num_rows, num_columns:]
+            - table[num_rows:, :-num_columns]
+            + table[:-num_rows, :-num_columns]
+        )
+        return used == 0
+
+    def used_area(self):
+        """
+        Returns the number of columns and rows up to the last used hole of
+        each, and the number of used holes.
+        """
+
+        used = self.grid != EMPTY
+        columns = np.flatnonzero(used.any(axis=0))
+        rows = np.flatnonzero(used.any(axis=1))
+        return (
+            int(columns[-1]) + 1 if len(columns) > 0 else 0,
+            int(rows[-1]) + 1 if len(rows) > 0 else 0,
+            int(used.sum()),
+        )
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import tempfile
+
+
+def netlistHash(component_list, connections, ordered=False):
+    """
+    Returns a hex digest identifying a netlist independently of the order of
+    components, connections and the pins within each connection. If ordered
+    is True, the order of the components is part of the digest, for placements
+    that depend on it.
+    """
+
+    components = []
+    for component in component_list:
+        entry = {
+            "type": type(component).__name__,
+            "name": component.name,
+            "legs": list(component.legs),
+            "ic": component.ic,
+        }
+        if component.ic:
+            entry["sequential_legs"] = [list(s) for s in component.sequential_legs]
+        components.append(entry)
+
+    pins = set(connections.keys())
+    edges = set()
+    for node, neighbors in connections.items():
+        pins.update(neighbors)
+        for neighbor in neighbors:
+            edges.add(tuple(sorted((node, neighbor))))
+
+    canonical = {
+        "components": sorted(components, key=lambda c: (c["name"], c["type"])),
+        "pins": sorted(pins),
+        "edges": sorted(edges),
+    }
+    if ordered:
+        canonical["order"] = [component.name for component in component_list]
+
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PlacementCache:
+    """
+    Content-addressed on-disk cache of solved placements, keyed by netlistHash.
+
+    Each entry is a small JSON file. Entries are evicted least recently used
+    first once there are more than max_entries of them, or they take up more
+    than max_bytes on disk.
+    """
+
+    def __init__(self, path=None, max_entries=1024, max_bytes=None):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".cache", "wadjet")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key):
+        """
+        Returns the cached entry for key, or None if there is none.
+        """
+
+        file_name = self._file(key)
+
+        try:
+            with open(file_name) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(file_name)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores a JSON serialisable entry under key, then evicts if needed.
+        """
+
+        # Write to a temporary file first so concurrent readers never see a
+        # partially written entry
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_name, self._file(key))
+
+        self.evict()
+
+    def entries(self):
+        """
+        Returns (path, size, last used time) of every entry, oldest first.
+        """
+
+        entries = []
+        for file_name in os.listdir(self.path):
+            if not file_name.endswith(".json"):
+                continue
+            full_name = os.path.join(self.path, file_name)
+            try:
+                stat = os.stat(full_name)
+            except OSError:
+                continue
+            entries.append((full_name, stat.st_size, stat.st_mtime))
+
+        return sorted(entries, key=lambda e: e[2])
+
+    def evict(self):
+        entries = self.entries()
+        total_bytes = sum(e[1] for e in entries)
+
+        while len(entries) > 0 and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and total_bytes > self.max_bytes)
+        ):
+            full_name, size, _ = entries.pop(0)
+            try:
+                os.remove(full_name)
+            except OSError:
+                pass
+            total_bytes -= size
+
+    def clear(self):
+        for full_name, _, _ in self.entries():
+            os.remove(full_name)
+
+    def __len__(self):
+        return len(self.entries())
@@ -0,0 +1,299 @@
+"""
+The wadjet command: place (and optionally render) a JSON netlist, either in a
+warm server process listening on a Unix socket or, if none is running, in
+process.
+
+    wadjet serve &
+    wadjet place netlist.json --render board --formats png
+
+A JSON netlist has the components and connections as in the README:
+
+    {
+        "components": [
+            {"type": "Resistor", "name": "R1"},
+            {"type": "OpAmp", "name": "U1", "package_size": 2}
+        ],
+        "connections": {"R1_out": ["U1_inverting_input_1"]}
+    }
+
+Only the standard library is imported until a placement is made in process,
+so the client starts quickly.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+
+# Options of a place request that are passed on to placeBoard
+PLACE_OPTIONS = ("time_limit", "num_workers", "engine", "previous", "pack")
+
+
+def defaultSocketPath():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir())
+    return os.path.join(runtime_dir, f"wadjet-{os.getuid()}.sock")
+
+
+def netlistFromJSON(netlist):
+    """
+    Returns the (component_list, connections) of a JSON netlist. Each component
+    has the name of a class in wadjet.components as its type, and the other
+    keys are passed to its constructor.
+    """
+
+    from wadjet import components
+
+    component_list = []
+    for entry in netlist["components"]:
+        entry = dict(entry)
+        component_type = entry.pop("type")
+        component_class = getattr(components, component_type, None)
+        if not (
+            isinstance(component_class, type)
+            and issubclass(component_class, components.Component)
+        ):
+            raise ValueError(f"Unknown component type {component_type}")
+        component_list.append(component_class(**entry))
+
+    connections = {
+        pin: list(pins) for pin, pins in netlist.get("connections", {}).items()
+    }
+
+    return component_list, connections
+
+
+def placementToJSON(placement):
+    return {
+        "strips": placement.strips,
+        "legs_to_strips": placement.legs_to_strips,
+        "component_legs": {
+            name: list(legs) for name, legs in placement.component_legs.items()
+        },
+        "component_columns": placement.component_columns,
+        "ic_positions": {
+            name: list(position) for name, position in placement.ic_positions.items()
+        },
+        "ic_legs": {name: list(legs) for name, legs in placement.ic_legs.items()},
+        "cuts": [list(cut) for cut in placement.cuts],
+        "hints_kept": placement.hints_kept,
+        "statistics": placement.statistics,
+        "timings": placement.timings,
+    }
+
+
+def handleRequest(request):
+    """
+    Places the netlist of a request and renders it if asked to, returning the
+    response. Errors are reported in the response rather than raised.
+    """
+
+    try:
+        from wadjet.core import placeBoard, renderBoard
+
+        component_list, connections = netlistFromJSON(request["netlist"])
+        options = {
+            key: value
+            for key, value in request.get("options", {}).items()
+            if key in PLACE_OPTIONS
+        }
+
+        placement = placeBoard(component_list, connections, **options)
+        response = {"ok": True, "placement": placementToJSON(placement)}
+
+        render = request.get("render")
+        if render is not None:
+            name = render.get("name", "board")
+            backend = render.get("backend", "matplotlib")
+            formats = render.get("formats")
+            board = renderBoard(
+                placement,
+                name=name,
+                formats=tuple(formats) if formats is not None else None,
+                backend=backend,
+            )
+            response["files"] = [os.path.abspath(f) for f in board.files]
+
+        return response
+
+    except Exception as error:
+        return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """
+    Handles one JSON request line per connection, and writes one JSON
+    response line.
+    """
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            request = None
+            response = {"ok": False, "error": f"Bad request: {error}"}
+
+        if request is not None:
+            command = request.get("command", "place")
+            if command == "ping":
+                response = {"ok": True, "pid": os.getpid()}
+            elif command == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown).start()
+            elif command == "place":
+                response = handleRequest(request)
+            else:
+                response = {"ok": False, "error": f"Unknown command {command}"}
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def makeServer(socket_path=None):
+    """
+    Returns a server listening on socket_path, after importing everything a
+    placement needs so that requests start warm. Requests are handled one at a
+    time, as pyplot is not thread safe. Call serve_forever on it.
+    """
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import wadjet.core
+    import wadjet.graphics
+
+    socket_path = socket_path or defaultSocketPath()
+
+    # A socket file left by a server that is no longer running
+    if os.path.exists(socket_path) and not _serverRunning(socket_path):
+        os.remove(socket_path)
+
+    return socketserver.UnixStreamServer(socket_path, _Handler)
+
+
+def serve(socket_path=None):
+    server = makeServer(socket_path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(server.server_address)
+
+
+def _send(request, socket_path, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+def _serverRunning(socket_path):
+    try:
+        return _send({"command": "ping"}, socket_path, timeout=1)["ok"]
+    except (OSError, ValueError):
+        return False
+
+
+def requestPlacement(
+    netlist, options=None, render=None, socket_path=None, fallback=True
+):
+    """
+    Places a JSON netlist in the server on socket_path, or in process if no
+    server is running and fallback is True. render is None, or a dict with the
+    name, formats and backend to render to. Returns the response dict, with
+    "ok", and "placement" and "files" or "error".
+
+    The server and the client should share a working directory, or render
+    names should be absolute, as the server writes the files.
+    """
+
+    request = {"command": "place", "netlist": netlist, "options": options or {}}
+    if render is not None:
+        request["render"] = render
+
+    try:
+        return _send(request, socket_path or defaultSocketPath())
+    except (FileNotFoundError, ConnectionRefusedError):
+        if not fallback:
+            raise
+        return handleRequest(request)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="wadjet", description=__doc__.splitlines()[1])
+    parser.add_argument("--socket", default=None, help="Unix socket of the server")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("serve", help="run a warm placement server")
+    commands.add_parser("stop", help="stop a running server")
+
+    place = commands.add_parser("place", help="place a JSON netlist")
+    place.add_argument("netlist", help="JSON netlist file, or - for stdin")
+    place.add_argument("--time-limit", type=float, default=None)
+    place.add_argument("--engine", default=None)
+    place.add_argument("--render", metavar="NAME", default=None)
+    place.add_argument("--formats", nargs="+", default=None)
+    place.add_argument("--backend", default="matplotlib")
+    place.add_argument(
+        "--no-server", action="store_true", help="always place in process"
+    )
+
+    args = parser.parse_args(argv)
+    socket_path = args.socket or defaultSocketPath()
+
+    if args.command == "serve":
+        serve(socket_path)
+        return 0
+
+    if args.command == "stop":
+        try:
+            _send({"command": "shutdown"}, socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            print("No server running", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.netlist == "-":
+        netlist = json.load(sys.stdin)
+    else:
+        with open(args.netlist) as f:
+            netlist = json.load(f)
+
+    options = {}
+    if args.time_limit is not None:
+        options["time_limit"] = args.time_limit
+    if args.engine is not None:
+        options["engine"] = args.engine
+
+    render = None
+    if args.render is not None:
+        render = {
+            "name": os.path.abspath(args.render),
+            "formats": args.formats,
+            "backend": args.backend,
+        }
+
+    if args.no_server:
+        request = {"netlist": netlist, "options": options, "render": render}
+        response = handleRequest(request)
+    else:
+        response = requestPlacement(netlist, options, render, socket_path)
+
+    json.dump(response, sys.stdout, indent=2)
+    print()
+
+    if not response["ok"]:
+        print(response["error"], file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -1,8 +1,47 @@
+from functools import lru_cache
+
+
 class Component:
+    """
+    Base class for components. Components use __slots__, and their unique leg
+    names are built on first use and cached as tuples, so the legs should be
+    set up in __init__ and not changed in place afterwards.
+    """
+
+    __slots__ = ("_name", "value", "_legs", "_sequential_legs", "_unique_leg_names")
+
     def __init__(self, name, value=None):
+        self._unique_leg_names = None
         self.name = name
         self.value = value
-        self.legs = []
+        self.legs = ()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._unique_leg_names = None
+
+    @property
+    def legs(self):
+        return self._legs
+
+    @legs.setter
+    def legs(self, legs):
+        self._legs = legs
+        self._unique_leg_names = None
+
+    @property
+    def sequential_legs(self):
+        return self._sequential_legs
+
+    @sequential_legs.setter
+    def sequential_legs(self, sequential_legs):
+        self._sequential_legs = sequential_legs
+        self._unique_leg_names = None
 
     @property
     def ic(self):
@@ -13,22 +52,28 @@ class Component:
         return "gray"  # default color for a generic component
 
     def unique_leg_names(self):
-        if not self.ic:
-            return [f"{self.name}_{leg}" for leg in self.legs]
-        else:
-            return [
-                [f"{self.name}_{leg}" for leg in self.sequential_legs[0]],
-                [f"{self.name}_{leg}" for leg in self.sequential_legs[1]],
-            ]
+        names = self._unique_leg_names
+        if names is None:
+            if not self.ic:
+                names = tuple(f"{self.name}_{leg}" for leg in self.legs)
+            else:
+                names = (
+                    tuple(f"{self.name}_{leg}" for leg in self.sequential_legs[0]),
+                    tuple(f"{self.name}_{leg}" for leg in self.sequential_legs[1]),
+                )
+            self._unique_leg_names = names
+        return names
 
     def __repr__(self):
         return f"{self.name} ({self.value}) - Color: {self.color} - Legs: {', '.join(self.unique_leg_names())}"
 
 
 class Resistor(Component):
+    __slots__ = ()
+
     def __init__(self, name, value=None):
         super().__init__(name, value)
-        self.legs = ["in", "out"]
+        self.legs = ("in", "out")
 
     @property
     def color(self):
@@ -36,9 +81,11 @@ class Resistor(Component):
 
 
 class Capacitor(Component):
+    __slots__ = ()
+
     def __init__(self, name, value=None, electrolytic=False):
         super().__init__(name, value)
-        self.legs = ["anode", "cathode"] if electrolytic else ["in", "out"]
+        self.legs = ("anode", "cathode") if electrolytic else ("in", "out")
 
     @property
     def color(self):
@@ -46,9 +93,11 @@ class Capacitor(Component):
 
 
 class Diode(Component):
+    __slots__ = ()
+
     def __init__(self, name, value=None):
         super().__init__(name, value)
-        self.legs = ["anode", "cathode"]
+        self.legs = ("anode", "cathode")
 
     @property
     def color(self):
@@ -56,39 +105,47 @@ class Diode(Component):
 
 
 class Potentiometer(Component):
+    __slots__ = ()
+
     def __init__(self, name, value=None):
         super().__init__(name, value)
-        self.legs = ["terminal1", "wiper", "terminal2"]
+        self.legs = ("terminal1", "wiper", "terminal2")
 
     @property
     def color(self):
         return "orange"
 
 
-class OpAmp(Component):
-    def __init__(self, name, value=None, package_size=1):
-        super().__init__(name, value)
+@lru_cache(maxsize=None)
+def _opAmpLegs(package_size):
+    """
+    Leg layout of an OpAmp package, shared by all OpAmps of the same size.
+    """
 
-        self.package_size = package_size
+    legs1 = ["-5V"]
+    for i in range(1, (package_size // 2) + 1):
+        legs1.extend(
+            [f"non_inverting_input_{i}", f"inverting_input_{i}", f"output_{i}"]
+        )
+
+    legs2 = []
+    for i in range((package_size // 2) + 1, package_size + 1):
+        legs2.extend(
+            [f"non_inverting_input_{i}", f"inverting_input_{i}", f"output_{i}"]
+        )
+    legs2.append("5V")
 
-        legs1 = ["-5V"]
-        for i in range(1, (package_size // 2) + 1):
-            legs1.extend(
-                [f"non_inverting_input_{i}", f"inverting_input_{i}", f"output_{i}"]
-            )
+    return (tuple(legs1), tuple(legs2)), tuple(legs1 + legs2)
 
-        legs2 = []
-        for i in range((package_size // 2) + 1, package_size + 1):
-            legs2.extend(
-                [f"non_inverting_input_{i}", f"inverting_input_{i}", f"output_{i}"]
-            )
-        legs2.append("5V")
 
-        self.sequential_legs = [legs1, legs2]
+class OpAmp(Component):
+    __slots__ = ("package_size",)
+
+    def __init__(self, name, value=None, package_size=1):
+        super().__init__(name, value)
 
-        self.legs = []
-        self.legs.extend(legs1)
-        self.legs.extend(legs2)
+        self.package_size = package_size
+        self.sequential_legs, self.legs = _opAmpLegs(package_size)
 
     @property
     def color(self):
@@ -99,26 +156,33 @@ class OpAmp(Component):
         return True
 
 
-class SchmittTrigger(Component):
-    def __init__(self, name, value=None, package_size=1):
-        super().__init__(name, value)
+@lru_cache(maxsize=None)
+def _schmittTriggerLegs(package_size):
+    """
+    Leg layout of a SchmittTrigger package, shared by all SchmittTriggers of
+    the same size.
+    """
 
-        self.package_size = package_size
+    legs1 = ["GND"]
+    for i in range(1, (package_size // 2) + 1):
+        legs1.extend([f"output_{i}", f"input_{i}"])
+
+    legs2 = []
+    for i in range((package_size // 2) + 1, package_size + 1):
+        legs2.extend([f"output_{i}", f"input_{i}"])
+    legs2.append("5V")
 
-        legs1 = ["GND"]
-        for i in range(1, (package_size // 2) + 1):
-            legs1.extend([f"output_{i}", f"input_{i}"])
+    return (tuple(legs1), tuple(legs2)), tuple(legs1 + legs2)
 
-        legs2 = []
-        for i in range((package_size // 2) + 1, package_size + 1):
-            legs2.extend([f"output_{i}", f"input_{i}"])
-        legs2.append("5V")
 
-        self.sequential_legs = [legs1, legs2]
+class SchmittTrigger(Component):
+    __slots__ = ("package_size",)
+
+    def __init__(self, name, value=None, package_size=1):
+        super().__init__(name, value)
 
-        self.legs = []
-        self.legs.extend(legs1)
-        self.legs.extend(legs2)
+        self.package_size = package_size
+        self.sequential_legs, self.legs = _schmittTriggerLegs(package_size)
 
     @property
     def color(self):
@@ -130,10 +194,12 @@ class SchmittTrigger(Component):
 
 
 class BJT(Component):
+    __slots__ = ("bjt_type",)
+
     def __init__(self, name, bjt_type, value=None):
         super().__init__(name, value)
         self.bjt_type = bjt_type
-        self.legs = ["base", "collector", "emitter"]
+        self.legs = ("base", "collector", "emitter")
         self.sequential_legs = self.legs
 
     @property
@@ -145,15 +211,17 @@ class BJT(Component):
 
 
 class PowerSupply(Component):
+    __slots__ = ("voltage_level",)
+
     def __init__(self, name, voltage_level):
         super().__init__(name)
         self.voltage_level = voltage_level
         if self.voltage_level == "5V":
-            self.legs = ["V+"]
+            self.legs = ("V+",)
         elif self.voltage_level == "-5V":
-            self.legs = ["V-"]
+            self.legs = ("V-",)
         elif self.voltage_level == "GND":
-            self.legs = ["GND"]
+            self.legs = ("GND",)
 
     @property
     def color(self):
@@ -166,11 +234,13 @@ class PowerSupply(Component):
 
 
 class Jumper(Component):
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name, 0)
         self.name = name
 
-        self.legs = ["start", "end"]
+        self.legs = ("start", "end")
         self.sequential_legs = self.legs
 
 
@@ -1,25 +1,20 @@
-import matplotlib as mpl
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
 
-mpl.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-
-rcParams["axes.facecolor"] = "FFFFFF"
-rcParams["savefig.facecolor"] = "FFFFFF"
-rcParams["xtick.direction"] = "in"
-rcParams["ytick.direction"] = "in"
-
-rcParams.update({"figure.autolayout": True})
-
-rcParams["figure.figsize"] = (16, 9)
-
-from collections import defaultdict
+from pprint import pprint
 
 import numpy as np
 
-from pprint import pprint
-
-from wadjet.optimise import optimisePlacement, connectedComponentStrips
+from wadjet.optimise import optimisePlacement, exportConnectionGraph
+from wadjet.board import Board
+from wadjet.netlist import Netlist
+from wadjet.packing import packStrips, stripExtents
+from wadjet.heuristic import heuristicPlacement
+from wadjet.lns import lnsPlacement
+from wadjet.portfolio import racePlacement
+from wadjet.cache import netlistHash
+from wadjet.instrument import StageTimer, logger
 from wadjet.components import (
     Jumper,
     Diode,
@@ -30,98 +25,96 @@ from wadjet.components import (
     PowerSupply,
     BJT,
 )
-from wadjet.graphics import Stripboard
 
+# Above this many strips, CP-SAT rarely proves optimality in reasonable time
+HEURISTIC_MIN_STRIPS = 100
 
-def sequentialPinGroups(components, strips):
+
+def sequentialPinGroups(components, strips=None):
     """
     Returns a dictionary mapping each IC component to a list of strip indices.
     The list for each IC is sorted by the pin order of the IC.
+
+    components is a Netlist, or a component list with the strips from
+    stripsToPlace.
     """
 
-    # Create a dictionary mapping IC names to their pin orders
-    ic_pin_order = {
-        c.name: {
-            pin_name: idx
-            for idx, pin_name in enumerate(
-                c.unique_leg_names()[0] + c.unique_leg_names()[1]
-            )
-        }
-        for c in components
-        if c.ic
-    }
+    netlist = components
+    if not isinstance(netlist, Netlist):
+        netlist = Netlist.from_strips(components, strips)
 
-    # Create a mapping of each IC to the strips its pins are connected to
-    ic_strip_order = {}
-    for ic, pin_order in ic_pin_order.items():
-        ic_strip_order[ic] = [
-            (strip_idx, pin_order[pin])
-            for strip_idx, strip in enumerate(strips)
-            for pin in strip
-            if pin in pin_order
-        ]
+    # IC pins on a strip, sorted by IC and then by pin order
+    pins = np.flatnonzero(
+        (netlist.pin_component >= 0)
+        & netlist.is_ic[netlist.pin_component]
+        & (netlist.pin_strip >= 0)
+    )
+    pins = pins[np.lexsort((netlist.pin_leg[pins], netlist.pin_component[pins]))]
+
+    ics = np.flatnonzero(netlist.is_ic)
+    bounds = np.searchsorted(netlist.pin_component[pins], np.append(ics, -1))
+    bounds[-1] = len(pins)
 
-    # Sort the strips for each IC by pin order and extract the strip indices
     sequential_groups = {
-        ic: [s[0] for s in sorted(order, key=lambda x: x[1])]
-        for ic, order in ic_strip_order.items()
+        netlist.components[ic].name: netlist.pin_strip[pins[start:end]].tolist()
+        for ic, start, end in zip(ics, bounds[:-1], bounds[1:])
     }
 
     return sequential_groups
 
 
-def stripsToPlace(connections, component_list):
+def stripsToPlace(connections, component_list=None, graph_file=None):
     """
-    Returns a list of strips based on provided connections and component list.
+    Returns a list of strips based on provided connections and component list,
+    or on a Netlist: one for each net, and a dummy strip for each pair of
+    opposite IC pins that are both unused.
     """
 
-    # Helper function to collect all pins from connections
-    def collect_pins_from_connections(connections):
-        pins = set(connections.keys())
-        for pin_list in connections.values():
-            pins.update(pin_list)
-        return pins
+    netlist = connections
+    if not isinstance(netlist, Netlist):
+        netlist = Netlist(component_list, connections)
 
-    # Helper function to get dummy strips for IC legs not used
-    def get_dummy_strips_for_ic(component_list, pins):
-        dummy_strips = []
-        for component in component_list:
-            if component.ic:
-                for leg1, leg2 in zip(
-                    component.unique_leg_names()[0], component.unique_leg_names()[1]
-                ):
-                    if leg1 not in pins and leg2 not in pins:
-                        dummy_strips.append([leg1])
-        return dummy_strips
+        if graph_file is not None:
+            exportConnectionGraph(connections, graph_file)
 
-    pins = collect_pins_from_connections(connections)
-    strips = connectedComponentStrips(connections)
-    dummy_strips = get_dummy_strips_for_ic(component_list, pins)
+    return netlist.strips()
 
-    return strips + dummy_strips
 
-
-def connectedStrips(strips):
+def connectedStrips(strips, multiplicity=False):
     """
     Returns pairs of strip indices that have overlapping component names.
+
+    If multiplicity is True, returns a dictionary mapping each pair to the
+    number of components that link the two strips instead.
+
+    strips is a Netlist, or a list of strips of pin names. For the latter the
+    component of each pin is taken to be the part of its name before the first
+    underscore, which is wrong for names such as jumper_0; prefer a Netlist.
     """
 
-    # Helper function to extract component names from pins
-    def extract_component_names(strip):
-        return [pin.split("_")[0] for pin in strip]
+    # Index the strips that each component has a pin on
+    component_strips = defaultdict(list)
+    if isinstance(strips, Netlist):
+        components, strip_ids = strips.component_strips()
+        for component, strip_idx in zip(components.tolist(), strip_ids.tolist()):
+            component_strips[component].append(strip_idx)
+    else:
+        seen = defaultdict(set)
+        for strip_idx, strip in enumerate(strips):
+            for pin in strip:
+                seen[pin.split("_")[0]].add(strip_idx)
+        for component, strip_ids in seen.items():
+            component_strips[component] = sorted(strip_ids)
 
-    connected_pairs = []
+    # Every pair of strips sharing a component is connected
+    pair_counts = Counter()
+    for strip_ids in component_strips.values():
+        pair_counts.update(combinations(strip_ids, 2))
 
-    for s1, strip1 in enumerate(strips):
-        names1 = extract_component_names(strip1)
-        for s2 in range(
-            s1 + 1, len(strips)
-        ):  # Start from the next strip to avoid duplicates and self-comparisons
-            names2 = extract_component_names(strips[s2])
-            if any(name in names2 for name in names1):
-                connected_pairs.append((s1, s2))
+    if multiplicity:
+        return dict(sorted(pair_counts.items()))
 
-    return connected_pairs
+    return sorted(pair_counts)
 
 
 def componentLegsToPlace(component_list):
@@ -129,8 +122,26 @@ def componentLegsToPlace(component_list):
     Returns two lists:
     1. Legs to place from non-IC components.
     2. Legs to place from IC components.
+
+    component_list may also be a Netlist.
     """
 
+    if isinstance(component_list, Netlist):
+        netlist = component_list
+        names = netlist.pin_names
+        legs = [tuple(names[pin] for pin in pins) for pins in netlist.component_pins]
+
+        non_ic_legs_to_place = [
+            component_legs
+            for component_legs, ic in zip(legs, netlist.is_ic)
+            if not ic and len(component_legs) >= 2
+        ]
+        ic_legs_to_place = [
+            component_legs for component_legs, ic in zip(legs, netlist.is_ic) if ic
+        ]
+
+        return non_ic_legs_to_place, ic_legs_to_place
+
     # Extract legs for non-IC components
     non_ic_legs_to_place = [
         component.unique_leg_names()
@@ -149,53 +160,105 @@ def componentLegsToPlace(component_list):
     return non_ic_legs_to_place, ic_legs_to_place
 
 
-def detect_direct_ic_connections(connections):
-    ic_direct_connections = defaultdict(set)
-
-    # Iterate through each connection entry
-    for _, pins in connections.items():
-        ic_pins = [pin for pin in pins if "U1_" in pin]
-
-        if len(ic_pins) > 1:
-            for i in range(len(ic_pins)):
-                for j in range(i + 1, len(ic_pins)):
-                    ic_direct_connections[ic_pins[i]].add(ic_pins[j])
-                    ic_direct_connections[ic_pins[j]].add(ic_pins[i])
-
-    return dict(ic_direct_connections)
-
-
-def add_jumper_for_ic_connections(connections, component_list):
-    ic_direct_connections = detect_direct_ic_connections(connections)
-
-    # remove direct IC connections from the connections dictionary
-    for ic_pin, directly_connected in ic_direct_connections.items():
-        for junction, pins in connections.items():
-            if ic_pin in pins:
-                # This will remove the direct connections from the list of pins for each junction
-                pins = [pin for pin in pins if pin not in directly_connected]
-                connections[junction] = pins
-
-    # Now, add jumper components for these direct connections
-    jumper_count = 0
-    for ic_pin, directly_connected in ic_direct_connections.items():
-        for direct_connection in directly_connected:
-            jumper_name = f"jumper_{jumper_count}"
-            jumper = Jumper(name=jumper_name)
-            component_list.append(jumper)
+def placementHint(strips, previous):
+    """
+    Returns a dictionary mapping strip indices to their index in a previous
+    placement, matched through leg names. previous maps leg names to rows, as in
+    the legs_to_strips map of a previously generated board.
+    """
 
-            # Connection for jumper
-            jumper_connections = [ic_pin, direct_connection]
-            connections[jumper_name] = jumper_connections
+    hint = {}
+    for strip_idx, strip in enumerate(strips):
+        rows = [previous[leg] for leg in strip if leg in previous]
+        if len(rows) > 0:
+            # Most legs on this strip agree on where it used to be
+            hint[strip_idx] = Counter(rows).most_common(1)[0][0]
 
-            jumper_count += 1
+    return hint
 
-    return connections, component_list
 
+class Placement:
+    """
+    Result of placing components on a stripboard, without any drawing: the
+    strips in board order, the row of each leg, the legs and columns of the
+    components, the drawn position and legs of each IC, and the cuts as
+    (column, row). board is the Board of holes used.
+    """
 
-def generateBoard(component_list, connections, name="board"):
+    def __init__(
+        self,
+        strips,
+        legs_to_strips,
+        component_legs,
+        component_columns,
+        ic_positions,
+        solve=None,
+        hints_kept=None,
+        timings=None,
+        cuts=None,
+        ic_legs=None,
+    ):
+        self.strips = strips
+        self.legs_to_strips = legs_to_strips
+        self.component_legs = component_legs
+        self.component_columns = component_columns
+        self.ic_positions = ic_positions
+        # SolveResult of the strip ordering, None if it came from a cache
+        self.solve = solve
+        self.hints_kept = hints_kept
+        # Wall time in seconds of each stage of placeBoard
+        self.timings = timings if timings is not None else {}
+        self.cuts = cuts if cuts is not None else []
+        self.ic_legs = ic_legs if ic_legs is not None else {}
+        self.board = Board.from_placement(self)
+
+    @property
+    def statistics(self):
+        """
+        Solver statistics of the strip ordering, None if it came from a cache.
+        """
+
+        return self.solve.statistics() if self.solve is not None else None
+
+    @property
+    def num_rows(self):
+        return len(self.strips)
+
+    @property
+    def num_columns(self):
+        columns = [x + 1 for x in self.component_columns.values()]
+        columns += [x + 2 for x, _, _ in self.ic_positions.values()]
+        return max(columns, default=0)
+
+    def __repr__(self):
+        return f"Placement({self.num_rows} rows, {self.num_columns} columns)"
+
+
+def placeBoard(
+    component_list,
+    connections,
+    previous=None,
+    cache=None,
+    time_limit=None,
+    num_workers=None,
+    graph_file=None,
+    engine="cp-sat",
+    hooks=None,
+    cancellation=None,
+    pack=True,
+):
     """
-    Generates a board based on provided component_list and connections.
+    Places the components on a stripboard and returns a Placement, without
+    drawing anything. IC pins that share a net are put on strips of their own,
+    joined by jumpers; component_list and connections are not modified.
+
+    previous maps legs to rows from an earlier placement to warm start from,
+    and cache is an optional PlacementCache. engine is "cp-sat" for
+    optimisePlacement, "heuristic", "lns", "portfolio" (for time_limit seconds,
+    2 by default) or "auto" (the heuristic above HEURISTIC_MIN_STRIPS strips).
+    If pack is True, strips in separate columns share rows, cut between them.
+    hooks get the stage timings and solver statistics, and the connection graph
+    is exported to graph_file if it is given.
     """
 
     def order_strips_based_on_placements(placements, strips):
@@ -212,128 +275,414 @@ def generateBoard(component_list, connections, name="board"):
                 mapping[leg] = i
         return mapping
 
-    def place_non_ic_components(board, legs_to_place, legs_to_strips_map):
+    def place_non_ic_components(component_list):
 
-        """Place non-IC components on the board."""
+        """Place non-IC components on the board, one column each."""
 
-        mask = np.zeros((10, 10))
+        component_legs = {}
+        component_columns = {}
         x = 0
-        for component in legs_to_place:
-            for iLeg in range(len(component) - 1):
-                thisLeg = component[iLeg]
-                nextLeg = component[iLeg + 1]
-                y1 = legs_to_strips_map[thisLeg]
-                y2 = legs_to_strips_map[nextLeg]
-                board.add_component(
-                    (x, y1), (x, y2), color="red", name=thisLeg.split("_")[0]
-                )
-                mask[x][y1:y2] = 1
-            x += 1
-        return board, mask, x
+        for component in component_list:
+            legs = component.unique_leg_names()
+            if not component.ic and len(legs) >= 2:
+                component_legs[component.name] = legs
+                component_columns[component.name] = x
+                x += 1
+        return component_legs, component_columns, x
 
-    def place_ic_components(
-        board, ic_legs_to_place, legs_to_strips_map, component_map, start_x
-    ):
+    def place_ic_components(component_list, legs_to_strips_map, start_x):
 
         """Place IC components on the board."""
 
+        ic_positions = {}
+        ic_legs = {}
         x = start_x
-        for ic in ic_legs_to_place:
+        for component in component_list:
+            if not component.ic:
+                continue
+            rows = component.unique_leg_names()
+            ic = rows[0] + rows[1]
             for ileg, leg in enumerate(ic):
                 if leg in legs_to_strips_map:
 
                     level = ileg % (len(ic) // 2) - 1
                     corner = legs_to_strips_map[leg] - level
 
-                    name = leg.split("_")[0]
-                    component = component_map[name]
-
-                    board.add_ic((x + 1, corner), component.package_size + 2, name=name)
+                    ic_positions[component.name] = (
+                        x + 1,
+                        corner,
+                        component.package_size + 2,
+                    )
+                    ic_legs[component.name] = ic
 
                     break
-            x += 1  # Increment x for each IC
-        return board
+            x += 2  # Each IC is two holes wide
+        return ic_positions, ic_legs
+
+    def pack_strips(netlist, strips, connected_pairs, sequential_groups):
 
-    def detect_jumper_required_ic_connections(connected_components, components):
-        jumper_required_connections = []
+        """
+        Packs strips onto shared rows with packStrips, and returns the rows and
+        the connected pairs, their weights and the sequential groups of the
+        rows, with the cuts.
+        """
 
-        # Generate a list of all IC pins
-        ic_pins_list = []
-        for component in components:
+        _, component_columns, x = place_non_ic_components(netlist.components)
+        extents = {name: (x, x) for name, x in component_columns.items()}
+        for component in netlist.components:
             if component.ic:
-                ic_pins_list.extend([pin for pin in component.unique_leg_names()[0]])
-                ic_pins_list.extend([pin for pin in component.unique_leg_names()[1]])
+                extents[component.name] = (x + 1, x + 2)
+                x += 2
+
+        first, last = stripExtents(netlist, extents)
+
+        # Each row holds at most one strip with IC pins, so that the pins of
+        # different ICs never share a row
+        ic_pins = (netlist.pin_component >= 0) & netlist.is_ic[netlist.pin_component]
+        exclusive = np.zeros(netlist.num_strips, dtype=bool)
+        exclusive[netlist.pin_strip[ic_pins & (netlist.pin_strip >= 0)]] = True
+
+        row_of_strip, num_rows, cuts = packStrips(first, last, exclusive)
+        row_of_strip = row_of_strip.tolist()
+
+        rows = [[] for _ in range(num_rows)]
+        for strip_idx, strip in enumerate(strips):
+            rows[row_of_strip[strip_idx]].extend(strip)
+
+        weights = Counter(
+            tuple(sorted((row_of_strip[a], row_of_strip[b])))
+            for a, b in connected_pairs
+        )
+        row_groups = {
+            ic: [row_of_strip[strip_idx] for strip_idx in group]
+            for ic, group in sequential_groups.items()
+        }
+
+        return rows, sorted(weights), dict(weights), row_groups, cuts
+
+    timer = StageTimer(hooks)
+
+    with timer.stage("cache"):
+        # Packed rows and their cuts follow the columns of the components,
+        # which are given out in the order of component_list
+        key = (
+            netlistHash(component_list, connections, ordered=pack)
+            if cache is not None
+            else None
+        )
+        if key is not None and not pack:
+            key += "-unpacked"
+        cached = cache.get(key) if cache is not None else None
+
+    if cached is not None:
+
+        # Same netlist as before, so reuse its strips and placement
+        strips = cached["strips"]
+        placements = cached["placements"]
+        cuts = cached.get("cuts", [])
+        result = None
 
-        # For each connected component
-        for component in connected_components:
-            ic_pins_in_this_component = [
-                pin for pin in component if pin in ic_pins_list
-            ]
+        component_list = list(component_list) + [
+            Jumper(jumper_name) for jumper_name in cached["jumpers"]
+        ]
+
+    else:
+
+        with timer.stage("connectivity"):
+            netlist = Netlist(component_list, connections)
+            if graph_file is not None:
+                exportConnectionGraph(connections, graph_file)
+
+        with timer.stage("jumpers"):
+            jumper_names = netlist.insert_jumpers()
+            if len(jumper_names) > 0:
+                logger.debug("Jumpers required %s", jumper_names)
+
+        component_list = netlist.components
+        with timer.stage("connectivity"):
+            strips = stripsToPlace(netlist)
+
+        logger.debug("Strips %s", strips)
+
+        with timer.stage("connected_strips"):
+            connected_pairs = connectedStrips(netlist)
+        with timer.stage("sequential_groups"):
+            sequential_groups = sequentialPinGroups(netlist)
+
+        weights = None
+        cuts = []
+        if pack:
+            with timer.stage("packing"):
+                strips, connected_pairs, weights, sequential_groups, cuts = pack_strips(
+                    netlist, strips, connected_pairs, sequential_groups
+                )
+            logger.debug("Packed onto %d rows", len(strips))
+
+        hint = placementHint(strips, previous) if previous is not None else None
+        if engine == "auto":
+            engine = "heuristic" if len(strips) > HEURISTIC_MIN_STRIPS else "cp-sat"
+
+        with timer.stage("solve"):
+            if engine == "cp-sat":
+                result = optimisePlacement(
+                    connected_pairs=connected_pairs,
+                    sequential_groups=sequential_groups.values(),
+                    hint=hint,
+                    time_limit=time_limit,
+                    num_workers=num_workers,
+                    weights=weights,
+                    cancellation=cancellation,
+                )
+            elif engine == "portfolio":
+                result = racePlacement(
+                    connected_pairs=connected_pairs,
+                    sequential_groups=sequential_groups.values(),
+                    deadline=time_limit if time_limit is not None else 2.0,
+                    weights=weights,
+                    hint=hint,
+                    cancellation=cancellation,
+                )
+            elif engine == "heuristic":
+                result = heuristicPlacement(
+                    connected_pairs=connected_pairs,
+                    sequential_groups=sequential_groups.values(),
+                    weights=weights,
+                    time_limit=time_limit,
+                    cancellation=cancellation,
+                )
+            elif engine == "lns":
+                result = lnsPlacement(
+                    connected_pairs=connected_pairs,
+                    sequential_groups=sequential_groups.values(),
+                    weights=weights,
+                    time_limit=time_limit,
+                    num_workers=num_workers,
+                    cancellation=cancellation,
+                )
+            else:
+                raise ValueError(f"Unknown placement engine {engine}")
+        placements = result.placements
+
+        if hooks is not None:
+            hooks.on_solve(result.statistics())
+
+        # Only proven optimal placements are worth reusing
+        if cache is not None and result.optimal:
+            cache.put(
+                key,
+                {
+                    "strips": strips,
+                    "placements": placements,
+                    "jumpers": jumper_names,
+                    "cuts": cuts,
+                },
+            )
+
+    with timer.stage("layout"):
+        strips_ordered = order_strips_based_on_placements(placements, strips)
+        legs_to_strips_map = map_legs_to_strips(strips_ordered)
+
+        component_legs, component_columns, last_non_ic_x = place_non_ic_components(
+            component_list
+        )
+        ic_positions, ic_legs = place_ic_components(
+            component_list, legs_to_strips_map, last_non_ic_x
+        )
+        cuts = sorted((column, placements[row]) for column, row in cuts)
+
+    placement = Placement(
+        strips_ordered,
+        legs_to_strips_map,
+        component_legs,
+        component_columns,
+        ic_positions,
+        solve=result,
+        hints_kept=result.hints_kept if result is not None else None,
+        timings=timer.timings,
+        cuts=cuts,
+        ic_legs=ic_legs,
+    )
+
+    collisions = placement.board.collisions()
+    if len(collisions) > 0:
+        logger.warning("Holes used more than once at %s", collisions)
+
+    return placement
+
+
+def _pyplot():
+    """
+    Imports and configures pyplot on first use, so that placing a board without
+    rendering it never loads matplotlib.
+    """
+
+    import matplotlib as mpl
+
+    mpl.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib import rcParams
+
+    rcParams["axes.facecolor"] = "FFFFFF"
+    rcParams["savefig.facecolor"] = "FFFFFF"
+    rcParams["xtick.direction"] = "in"
+    rcParams["ytick.direction"] = "in"
 
-            # If multiple IC pins are in the same component, they are directly connected
-            if len(ic_pins_in_this_component) > 1:
-                for i in range(len(ic_pins_in_this_component) - 1):
-                    for j in range(i + 1, len(ic_pins_in_this_component)):
-                        jumper_required_connections.append(
-                            (ic_pins_in_this_component[i], ic_pins_in_this_component[j])
-                        )
-                        # REMOVE THESE
+    rcParams.update({"figure.autolayout": True})
 
-        return jumper_required_connections
+    rcParams["figure.figsize"] = (16, 9)
 
-    # connections, component_list = add_jumper_for_ic_connections(connections, component_list)
+    return plt
 
-    component_map = {c.name: c for c in component_list}
 
-    strips = stripsToPlace(connections, component_list)
+def renderBoard(
+    placement,
+    name="board",
+    formats=None,
+    close=True,
+    backend="matplotlib",
+    hooks=None,
+):
+    """
+    Draws a Placement on a Stripboard just large enough for it, and saves it as
+    name.<format> for each of formats (pdf and png, or svg and txt with the
+    "svg" backend). Returns the board, with the files written and the timings.
+    """
+
+    timer = StageTimer(hooks)
+
+    # The drawn boards are square
+    size = max(placement.board.num_columns, placement.board.num_rows, 1)
 
-    jumpers = detect_jumper_required_ic_connections(strips, component_list)
+    if backend == "matplotlib":
+        plt = _pyplot()
+        from wadjet.graphics import Stripboard
 
-    if len(jumpers) > 0:
+        board = Stripboard(size)
+        formats = ("pdf", "png") if formats is None else formats
+    elif backend == "svg":
+        from wadjet.svg import SVGStripboard
 
-        print(jumpers)
+        board = SVGStripboard(size)
+        formats = ("svg", "txt") if formats is None else formats
+        for file_format in formats:
+            if file_format not in ("svg", "txt"):
+                raise ValueError(f"The svg backend cannot write {file_format} files")
+    else:
+        raise ValueError(f"Unknown backend {backend}")
 
-        for pair in jumpers:
+    with timer.stage("draw"):
+        rows = placement.legs_to_strips
+
+        for component, legs in placement.component_legs.items():
+            x = placement.component_columns[component]
+            for this_leg, next_leg in zip(legs[:-1], legs[1:]):
+                board.add_component(
+                    (x, rows[this_leg]),
+                    (x, rows[next_leg]),
+                    color="red",
+                    name=component,
+                )
 
-            j = Jumper(f"jumper_{pair[0]}_{pair[1]}")
-            component_list.append(j)
+        for ic, (x, corner, size) in placement.ic_positions.items():
+            board.add_ic((x, corner), size, name=ic)
 
-            if pair[0] in connections:
-                connections[pair[0]].append(f"jumper_{pair[0]}_{pair[1]}_start")
+        for column, row in placement.cuts:
+            board.add_break(column, (row, row + 1))
+
+    board.files = []
+    for file_format in formats:
+        board.files.append(f"{name}.{file_format}")
+        with timer.stage(f"savefig_{file_format}"):
+            if file_format == "png":
+                board.savefig(f"{name}.{file_format}", dpi=300)
             else:
-                connections[pair[0]] = [f"jumper_{pair[0]}_{pair[1]}_end"]
+                board.savefig(f"{name}.{file_format}")
 
-    strips = stripsToPlace(connections, component_list)
+    if close and backend == "matplotlib":
+        plt.close(board.fig)
 
-    pprint(strips)
+    board.timings = timer.timings
 
-    connected_pairs = connectedStrips(strips)
-    sequential_groups = sequentialPinGroups(component_list, strips)
-    placements = optimisePlacement(
-        connected_pairs=connected_pairs, sequential_groups=sequential_groups.values()
-    )
+    return board
 
-    board = Stripboard(8)
 
-    strips_ordered = order_strips_based_on_placements(placements, strips)
-    legs_to_strips_map = map_legs_to_strips(strips_ordered)
-    legs_to_place, ic_legs_to_place = componentLegsToPlace(component_list)
+def generateBoard(
+    component_list,
+    connections,
+    name="board",
+    previous=None,
+    cache=None,
+    time_limit=None,
+    num_workers=None,
+    graph_file=None,
+    engine="cp-sat",
+    hooks=None,
+):
+    """
+    Generates a board based on provided component_list and connections.
 
-    mask = np.zeros((8, 8))
-    board, mask, last_non_ic_x = place_non_ic_components(
-        board, legs_to_place, legs_to_strips_map
-    )
-    board = place_ic_components(
-        board, ic_legs_to_place, legs_to_strips_map, component_map, last_non_ic_x
+    Places the board with placeBoard, to which the other arguments are passed,
+    then draws it with renderBoard to name.pdf and name.png. The returned board
+    has the Placement as its placement attribute, the wall time of every stage
+    as timings and the solver statistics as statistics, all of which are also
+    reported to hooks, an optional Hooks. The connection graph is only drawn
+    to graph_file if it is given.
+    """
+
+    placement = placeBoard(
+        component_list,
+        connections,
+        previous=previous,
+        cache=cache,
+        time_limit=time_limit,
+        num_workers=num_workers,
+        graph_file=graph_file,
+        engine=engine,
+        hooks=hooks,
     )
 
-    plt.savefig(f"{name}.pdf")
-    plt.savefig(f"{name}.png", dpi=300)
-    plt.clf()
+    board = renderBoard(placement, name=name, hooks=hooks)
+
+    board.placement = placement
+    board.legs_to_strips = placement.legs_to_strips
+    board.hints_kept = placement.hints_kept
+    board.timings = {**placement.timings, **board.timings}
+    board.statistics = placement.statistics
 
     return board
 
 
+def _placeBoardJob(component_list, connections, name, render, options):
+    placement = placeBoard(component_list, connections, **options)
+    if render:
+        renderBoard(placement, name=name)
+    return placement
+
+
+def generateBoards(jobs, max_workers=None, render=True, **options):
+    """
+    Places, and renders if render is True, a board for each (component_list,
+    connections, name) job in a pool of max_workers processes. Yields (name,
+    placement, error) as each job finishes; a failed job has the exception as
+    its error.
+    """
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _placeBoardJob, component_list, connections, name, render, options
+            ): name
+            for component_list, connections, name in jobs
+        }
+
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is None:
+                yield futures[future], future.result(), None
+            else:
+                yield futures[future], None, error
+
+
 if __name__ == "__main__":
 
     trigger = SchmittTrigger(name="trigger", package_size=6)
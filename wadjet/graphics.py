@@ -1,13 +1,31 @@
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import string
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+import numpy as np
+
+from wadjet.svg import row_label
 
 
 class Stripboard:
+    """
+    Stripboard drawn with matplotlib.
+
+    The board itself is drawn with one collection each for the strips and the
+    holes. Components, ICs and breaks are collected as they are added and drawn
+    as a few collections by flush, which savefig and show call for you.
+    """
+
     def __init__(self, N):
         self.N = N
         self.fig, self.ax = plt.subplots(figsize=(8, 8))
 
+        # Added components, drawn by flush
+        self._component_lines = []
+        self._component_colors = []
+        self._legs = []
+        self._ic_rects = []
+        self._breaks = []
+        self._flushed_artists = []
+
         self._configure_plot()
         self._draw_conductive_strips()
         self._draw_holes()
@@ -21,21 +39,41 @@ class Stripboard:
 
     def _draw_conductive_strips(self):
         self.strip_height = 0.8
-        for y in range(self.N):
-            rect = patches.Rectangle(
-                (0, y + (1 - self.strip_height) / 2),
-                self.N,
-                self.strip_height,
-                facecolor="black",
-                alpha=0.25,
+        y0 = np.arange(self.N) + (1 - self.strip_height) / 2
+        y1 = y0 + self.strip_height
+        x0 = np.zeros(self.N)
+        x1 = np.full(self.N, self.N)
+        rects = np.stack(
+            [
+                np.stack([x0, y0], axis=1),
+                np.stack([x1, y0], axis=1),
+                np.stack([x1, y1], axis=1),
+                np.stack([x0, y1], axis=1),
+            ],
+            axis=1,
+        )
+        self.ax.add_collection(
+            PolyCollection(
+                rects, facecolors="black", edgecolors="none", alpha=0.25, zorder=1
             )
-            self.ax.add_patch(rect)
+        )
 
     def _draw_holes(self):
-        for x in range(self.N):
-            for y in range(self.N):
-                circle = patches.Circle((x + 0.5, y + 0.5), radius=0.2, color="white")
-                self.ax.add_patch(circle)
+        x, y = np.meshgrid(np.arange(self.N) + 0.5, np.arange(self.N) + 0.5)
+        offsets = np.column_stack([x.ravel(), y.ravel()])
+        self.ax.add_collection(
+            EllipseCollection(
+                0.4,
+                0.4,
+                0.0,
+                units="xy",
+                offsets=offsets,
+                offset_transform=self.ax.transData,
+                facecolors="white",
+                edgecolors="none",
+                zorder=1.1,
+            )
+        )
 
     def _annotate_board(self):
         for x in range(self.N):
@@ -64,7 +102,7 @@ class Stripboard:
             self.ax.text(
                 -0.5,
                 y + 0.5,
-                string.ascii_uppercase[y],
+                row_label(y),
                 ha="center",
                 va="center",
                 fontsize=16,
@@ -74,7 +112,7 @@ class Stripboard:
             self.ax.text(
                 self.N + 0.5,
                 y + 0.5,
-                string.ascii_uppercase[y],
+                row_label(y),
                 ha="center",
                 va="center",
                 fontsize=16,
@@ -84,20 +122,10 @@ class Stripboard:
 
     def add_component(self, start, end, color="red", name=None):
         # Drawing a component as a line between two holes with rounded ends
-        self.ax.plot(
-            [start[0] + 0.5, end[0] + 0.5],
-            [start[1] + 0.5, end[1] + 0.5],
-            color=color,
-            linewidth=7.5,
-            solid_capstyle="round",
-        )
-        self.ax.plot(
-            [start[0] + 0.5, end[0] + 0.5],
-            [start[1] + 0.5, end[1] + 0.5],
-            ".",
-            color="k",
-            markersize=25,
-        )
+        segment = [(start[0] + 0.5, start[1] + 0.5), (end[0] + 0.5, end[1] + 0.5)]
+        self._component_lines.append(segment)
+        self._component_colors.append(color)
+        self._legs.extend(segment)
 
         if name:
             label_pos_x = start[0]  # - 0.5
@@ -111,6 +139,7 @@ class Stripboard:
                 ha="center",
                 va="center",
                 rotation=90,
+                zorder=3,
             )
 
     def add_ic(self, start, size, name=None):
@@ -118,17 +147,15 @@ class Stripboard:
         height = size / 2  # since the extent in y is half of the total pin count
         width = 2  # two units wide for the IC representation
 
-        # Draw IC rectangle
-        ic_rect = patches.Rectangle(
-            (x - 0.5, y - 0.5),
-            width,
-            height,
-            facecolor="grey",
-            edgecolor="black",
-            linewidth=3,
-            alpha=1.0,
+        # IC rectangle
+        self._ic_rects.append(
+            [
+                (x - 0.5, y - 0.5),
+                (x - 0.5 + width, y - 0.5),
+                (x - 0.5 + width, y - 0.5 + height),
+                (x - 0.5, y - 0.5 + height),
+            ]
         )
-        self.ax.add_patch(ic_rect)
 
         self.add_break(col=x, between=(y + 0 - 1, y + size // 2))
 
@@ -144,6 +171,7 @@ class Stripboard:
                 fontsize=14,
                 color="black",
                 rotation=90,
+                zorder=3,
             )
 
     def add_break(self, col, between):
@@ -151,15 +179,68 @@ class Stripboard:
         y_start = between[0]
         y_end = between[1]
 
-        self.ax.plot(
-            [x_coord, x_coord],
-            [y_start, y_end],
-            color="black",
-            linewidth=7.5,
-            linestyle="--",
-        )
+        self._breaks.append([(x_coord, y_start), (x_coord, y_end)])
+
+    def flush(self):
+        """
+        Draws everything added so far as one collection per kind of item.
+        """
+
+        for artist in self._flushed_artists:
+            artist.remove()
+        self._flushed_artists = []
+
+        if self._ic_rects:
+            self._flushed_artists.append(
+                self.ax.add_collection(
+                    PolyCollection(
+                        self._ic_rects,
+                        facecolors="grey",
+                        edgecolors="black",
+                        linewidths=3,
+                        zorder=1.5,
+                    )
+                )
+            )
+
+        if self._component_lines:
+            self._flushed_artists.append(
+                self.ax.add_collection(
+                    LineCollection(
+                        self._component_lines,
+                        colors=self._component_colors,
+                        linewidths=7.5,
+                        capstyle="round",
+                        zorder=2,
+                    )
+                )
+            )
+            legs = np.array(self._legs)
+            self._flushed_artists.append(
+                self.ax.scatter(
+                    legs[:, 0], legs[:, 1], s=25**2, marker=".", color="k", zorder=2.1
+                )
+            )
+
+        if self._breaks:
+            self._flushed_artists.append(
+                self.ax.add_collection(
+                    LineCollection(
+                        self._breaks,
+                        colors="black",
+                        linewidths=7.5,
+                        linestyles="--",
+                        zorder=2.2,
+                    )
+                )
+            )
+
+    def savefig(self, *args, **kwargs):
+        self.flush()
+        self.fig.savefig(*args, **kwargs)
 
     def show(self):
+        self.flush()
         plt.gca().invert_yaxis()
         plt.show()
 
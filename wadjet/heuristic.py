@@ -0,0 +1,227 @@
+import time
+
+import numpy as np
+
+from wadjet.optimise import SolveResult, independentBlocks
+
+
+def _placementItems(sequential_groups, num_strips):
+    """
+    Splits the strips into items that move as a unit: each sequential group is
+    one item with its strips in group order, every other strip is an item on
+    its own.
+
+    Returns arrays mapping each strip to its item and its offset within the
+    item, and the length of each item.
+    """
+
+    item_of = np.full(num_strips, -1, dtype=np.int64)
+    offset = np.zeros(num_strips, dtype=np.int64)
+    lengths = []
+
+    for group in sequential_groups:
+        if len(group) == 0:
+            continue
+        if len(set(group)) != len(group) or np.any(item_of[list(group)] >= 0):
+            raise RuntimeError(
+                "No feasible placement found (sequential groups share strips)"
+            )
+        item_of[list(group)] = len(lengths)
+        offset[list(group)] = np.arange(len(group))
+        lengths.append(len(group))
+
+    for strip in np.flatnonzero(item_of < 0):
+        item_of[strip] = len(lengths)
+        lengths.append(1)
+
+    return item_of, offset, np.array(lengths, dtype=np.int64)
+
+
+def spectralOrder(connected_pairs, weights, item_of, num_items):
+    """
+    Returns the items sorted by their entry in the Fiedler vector of the item
+    adjacency graph, which places strongly connected items close together.
+    Each connected part of the graph is ordered on its own, one after another.
+    """
+
+    item_pairs = item_of[connected_pairs].reshape(-1, 2)
+
+    W = np.zeros((num_items, num_items))
+    np.add.at(W, (item_pairs[:, 0], item_pairs[:, 1]), weights)
+    W = W + W.T
+    np.fill_diagonal(W, 0.0)
+
+    order = []
+    for block in independentBlocks(item_pairs, [], num_items):
+        if len(block) < 3:
+            order.extend(block)
+            continue
+
+        W_block = W[np.ix_(block, block)]
+        laplacian = np.diag(W_block.sum(axis=1)) - W_block
+        _, vectors = np.linalg.eigh(laplacian)
+
+        # Break ties on the item id so the order is deterministic
+        fiedler = np.round(vectors[:, 1], 12)
+        order.extend(np.array(block)[np.lexsort((block, fiedler))])
+
+    return np.array(order, dtype=np.int64)
+
+
+def heuristicPlacement(
+    connected_pairs,
+    sequential_groups,
+    weights=None,
+    time_limit=None,
+    max_passes=100,
+    tolerance=1e-3,
+    window=32,
+    seed=0,
+    callback=None,
+    cancellation=None,
+):
+    """
+    Fast approximate alternative to optimisePlacement for large boards. A
+    spectral ordering of the strips is improved by local search moving
+    sequential groups whole, for up to max_passes passes or time_limit seconds,
+    until a pass improves by less than tolerance.
+    """
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    sequential_groups = [list(group) for group in sequential_groups]
+
+    num_strips = (
+        max(
+            max((max(pair) for pair in connected_pairs), default=-1),
+            max((max(group) for group in sequential_groups if group), default=0),
+        )
+        + 1
+    )
+
+    pairs = np.array(connected_pairs, dtype=np.int64).reshape(-1, 2)
+    if weights is None:
+        w = np.ones(len(pairs))
+    else:
+        w = np.array(
+            [weights.get(tuple(pair), 1) for pair in connected_pairs], dtype=float
+        )
+
+    item_of, offset, lengths = _placementItems(sequential_groups, num_strips)
+    num_items = len(lengths)
+
+    a = pairs[:, 0]
+    b = pairs[:, 1]
+
+    def positions_of(order):
+        starts = np.empty(num_items, dtype=np.int64)
+        starts[order] = np.cumsum(lengths[order]) - lengths[order]
+        return starts[item_of] + offset
+
+    def cost_of(positions):
+        return float((np.abs(positions[a] - positions[b]) * w).sum())
+
+    order = spectralOrder(pairs, w, item_of, num_items)
+    positions = positions_of(order)
+    cost = cost_of(positions)
+    bound = float(w.sum())
+
+    # Position of each item within the window being searched, or -1
+    local = np.full(num_items, -1, dtype=np.int64)
+
+    def out_of_time():
+        if cancellation is not None and cancellation.cancelled:
+            return True
+        return time_limit is not None and time.perf_counter() - start > time_limit
+
+    for _ in range(max_passes):
+
+        pass_cost = cost
+
+        for item in rng.permutation(num_items):
+
+            if out_of_time():
+                break
+
+            # Only the items within window places of item are moved, so only
+            # the connections touching them change length
+            i = np.flatnonzero(order == item)[0]
+            lo = max(0, i - window)
+            hi = min(num_items, i + window + 1)
+            segment = order[lo:hi]
+            m = len(segment)
+            li = i - lo
+
+            columns = np.arange(m)[None, :]
+            slots = np.arange(m)[:, None]
+
+            # Every order of the window given by moving item to another slot
+            rest = np.append(np.delete(segment, li), item)
+            inserts = np.where(
+                columns == slots, item, rest[columns - (columns > slots)]
+            )
+
+            # Every order of the window given by swapping item with another
+            swaps = np.tile(segment, (m, 1))
+            swaps[:, li] = segment
+            swaps[np.arange(m), np.arange(m)] = item
+
+            candidates = np.concatenate((inserts, swaps))
+
+            local[segment] = np.arange(m)
+            base = positions[item_of == segment[0]].min()
+
+            # Start of each window item, indexed by its place in segment
+            cumulative = np.cumsum(lengths[candidates], axis=1) - lengths[candidates]
+            starts = np.empty_like(cumulative)
+            np.put_along_axis(starts, local[candidates], base + cumulative, axis=1)
+
+            la = local[item_of[a]]
+            lb = local[item_of[b]]
+            touched = (la >= 0) | (lb >= 0)
+            la, lb = la[touched], lb[touched]
+            ta, tb = a[touched], b[touched]
+
+            pa = np.where(
+                la >= 0, starts[:, np.maximum(la, 0)] + offset[ta], positions[ta]
+            )
+            pb = np.where(
+                lb >= 0, starts[:, np.maximum(lb, 0)] + offset[tb], positions[tb]
+            )
+            deltas = (np.abs(pa - pb) * w[touched]).sum(axis=1) - (
+                np.abs(positions[ta] - positions[tb]) * w[touched]
+            ).sum()
+
+            local[segment] = -1
+
+            best = np.argmin(deltas)
+            if deltas[best] < -1e-9:
+                order[lo:hi] = candidates[best]
+                positions = positions_of(order)
+                cost = cost_of(positions)
+
+                if callback is not None:
+                    callback(
+                        SolveResult(
+                            [int(p) for p in positions],
+                            objective=cost,
+                            status="FEASIBLE",
+                            bound=bound,
+                            wall_time=time.perf_counter() - start,
+                        )
+                    )
+
+        if pass_cost - cost <= tolerance * pass_cost or out_of_time():
+            break
+
+    if cancellation is not None:
+        cancellation.check()
+
+    return SolveResult(
+        [int(p) for p in positions],
+        objective=cost,
+        status="OPTIMAL" if cost == bound else "FEASIBLE",
+        bound=bound,
+        wall_time=time.perf_counter() - start,
+    )
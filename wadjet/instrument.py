@@ -0,0 +1,60 @@
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("wadjet")
+
+
+class Hooks:
+    """
+    Instrumentation hooks for placeBoard, renderBoard and generateBoard. The
+    methods do nothing; subclass and override the ones you need.
+    """
+
+    def on_stage(self, name, seconds):
+        """
+        Called when a pipeline stage finishes, with its wall time in seconds.
+        """
+
+    def on_solve(self, statistics):
+        """
+        Called after the strips are ordered, with the solver statistics dict
+        from SolveResult.statistics.
+        """
+
+
+class LoggingHooks(Hooks):
+    """
+    Hooks that log stage timings and solver statistics to the "wadjet" logger.
+    """
+
+    def __init__(self, level=logging.INFO):
+        self.level = level
+
+    def on_stage(self, name, seconds):
+        logger.log(self.level, "%s took %.3f s", name, seconds)
+
+    def on_solve(self, statistics):
+        logger.log(self.level, "solve %s", statistics)
+
+
+class StageTimer:
+    """
+    Records the wall time of each named pipeline stage in timings, adding up
+    stages that run more than once, and reports each one to hooks.
+    """
+
+    def __init__(self, hooks=None):
+        self.hooks = hooks
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            if self.hooks is not None:
+                self.hooks.on_stage(name, seconds)
@@ -0,0 +1,275 @@
+import time
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from wadjet.heuristic import _placementItems, heuristicPlacement
+from wadjet.instrument import logger
+from wadjet.optimise import SolveResult
+
+
+def _segments(order, lengths, item_ranges):
+    """
+    Returns the (first strip, number of strips) of each range of places in
+    order, merging ranges that overlap or touch.
+    """
+
+    starts = np.cumsum(lengths[order]) - lengths[order]
+
+    merged = []
+    for lo, hi in sorted(item_ranges):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+
+    return [
+        (int(starts[lo]), int(starts[hi - 1] + lengths[order[hi - 1]] - starts[lo]))
+        for lo, hi in merged
+    ], merged
+
+
+def lnsPlacement(
+    connected_pairs,
+    sequential_groups,
+    initial=None,
+    weights=None,
+    window=10,
+    time_limit=None,
+    max_iterations=None,
+    patience=None,
+    subproblem_time=0.5,
+    num_workers=None,
+    seed=0,
+    callback=None,
+    cancellation=None,
+):
+    """
+    Improves the placement initial (heuristicPlacement's if None) by large
+    neighbourhood search, re-ordering up to window items at a time with CP-SAT.
+    Stops after max_iterations iterations, time_limit seconds or patience
+    iterations without improvement. The arguments are as for optimisePlacement.
+    """
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    sequential_groups = [list(group) for group in sequential_groups]
+
+    if initial is None:
+        initial = heuristicPlacement(
+            connected_pairs,
+            sequential_groups,
+            weights=weights,
+            time_limit=time_limit / 4 if time_limit is not None else None,
+            cancellation=cancellation,
+        ).placements
+
+    positions = np.array(initial, dtype=np.int64)
+    num_strips = len(positions)
+
+    pairs = np.array(connected_pairs, dtype=np.int64).reshape(-1, 2)
+    if weights is None:
+        w = np.ones(len(pairs), dtype=np.int64)
+    else:
+        w = np.array(
+            [weights.get(tuple(pair), 1) for pair in connected_pairs], dtype=np.int64
+        )
+    a = pairs[:, 0]
+    b = pairs[:, 1]
+
+    item_of, offset, lengths = _placementItems(sequential_groups, num_strips)
+    num_items = len(lengths)
+
+    # The items in board order, from the position of their first strip
+    item_start = np.zeros(num_items, dtype=np.int64)
+    item_start[item_of] = positions - offset
+    order = np.argsort(item_start, kind="stable")
+
+    def cost_of(positions):
+        return int((np.abs(positions[a] - positions[b]) * w).sum())
+
+    cost = cost_of(positions)
+    bound = int(w.sum())
+
+    window = max(2, min(window, num_items))
+    step = max(1, window // 2)
+    if patience is None:
+        # Two sweeps of sliding windows, with the other neighbourhoods between
+        patience = 4 * -(-num_items // step)
+
+    total_branches = 0
+    total_conflicts = 0
+    iteration = 0
+    since_improvement = 0
+    sweep = 0
+
+    def out_of_time():
+        if cancellation is not None and cancellation.cancelled:
+            return True
+        return time_limit is not None and time.perf_counter() - start > time_limit
+
+    while num_items > 1 and cost > bound:
+
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        if since_improvement >= patience or out_of_time():
+            break
+
+        # Alternate sliding windows with the neighbourhoods of both ends of a
+        # long connection, picked with probability given by its length
+        if iteration % 2 == 0 or len(pairs) == 0:
+            lo = min(sweep % num_items, num_items - window)
+            sweep += step
+            item_ranges = [(lo, lo + window)]
+        else:
+            lengths_now = np.abs(positions[a] - positions[b]) * w
+            pair = rng.choice(len(pairs), p=lengths_now / lengths_now.sum())
+            place = np.empty(num_items, dtype=np.int64)
+            place[order] = np.arange(num_items)
+            item_ranges = []
+            for strip in (a[pair], b[pair]):
+                centre = place[item_of[strip]]
+                lo = max(0, min(centre - window // 4, num_items - window // 2))
+                item_ranges.append((lo, lo + max(1, window // 2)))
+
+        iteration += 1
+
+        segments, item_ranges = _segments(order, lengths, item_ranges)
+        free_items = np.concatenate([order[lo:hi] for lo, hi in item_ranges])
+
+        free = np.zeros(num_items, dtype=bool)
+        free[free_items] = True
+        # Connections whose length can change, as those within an item are
+        # fixed
+        touched = (free[item_of[a]] | free[item_of[b]]) & (item_of[a] != item_of[b])
+
+        # The sub-model: an interval for each free item that fits within one
+        # of the segments, with the strips of fixed items as constants
+        model = cp_model.CpModel()
+        domains = {}
+        item_vars = {}
+        for item in free_items.tolist():
+            length = int(lengths[item])
+            if length not in domains:
+                domains[length] = cp_model.Domain.FromIntervals(
+                    [
+                        [first, first + size - length]
+                        for first, size in segments
+                        if size >= length
+                    ]
+                )
+            item_start_var = model.NewIntVarFromDomain(domains[length], f"start_{item}")
+            model.AddHint(item_start_var, int(item_start[item]))
+            item_vars[item] = (
+                item_start_var,
+                model.NewFixedSizeIntervalVar(item_start_var, length, f"item_{item}"),
+            )
+        model.AddNoOverlap([interval for _, interval in item_vars.values()])
+
+        # Connections between free strips are modelled directly
+        both_free = touched & free[item_of[a]] & free[item_of[b]]
+        terms = []
+        for i in np.flatnonzero(both_free).tolist():
+            start_a, _ = item_vars[int(item_of[a[i]])]
+            start_b, _ = item_vars[int(item_of[b[i]])]
+            distance = model.NewIntVar(0, num_strips - 1, f"distance_{i}")
+            model.AddAbsEquality(
+                distance, start_a + int(offset[a[i]]) - start_b - int(offset[b[i]])
+            )
+            model.AddHint(distance, int(abs(positions[a[i]] - positions[b[i]])))
+            terms.append(int(w[i]) * distance)
+
+        # Connections from a free strip to a fixed one only depend on the start
+        # of its item, so their cost is tabulated over every start at once
+        one_free = touched & ~both_free
+        free_end = np.where(free[item_of[a]], a, b)[one_free]
+        fixed_end = np.where(free[item_of[a]], b, a)[one_free]
+        free_item = item_of[free_end]
+        candidates = np.arange(num_strips)
+        for item in np.unique(free_item).tolist():
+            mine = free_item == item
+            table = (
+                np.abs(
+                    candidates[:, None]
+                    + offset[free_end[mine]][None, :]
+                    - positions[fixed_end[mine]][None, :]
+                )
+                @ w[one_free][mine]
+            )
+
+            item_cost = model.NewIntVar(0, int(table.max()), f"cost_{item}")
+            model.AddElement(item_vars[item][0], table.tolist(), item_cost)
+            model.AddHint(item_cost, int(table[item_start[item]]))
+            terms.append(item_cost)
+
+        model.Minimize(sum(terms))
+
+        old_cost = int((np.abs(positions[a] - positions[b]) * w)[touched].sum())
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = subproblem_time
+        if num_workers is not None:
+            solver.parameters.num_workers = num_workers
+        if time_limit is not None:
+            solver.parameters.max_time_in_seconds = max(
+                0.01,
+                min(subproblem_time, time_limit - (time.perf_counter() - start)),
+            )
+
+        if cancellation is not None:
+            cancellation._add(solver)
+        try:
+            status = solver.Solve(model)
+        finally:
+            if cancellation is not None:
+                cancellation._remove(solver)
+
+        total_branches += solver.NumBranches()
+        total_conflicts += solver.NumConflicts()
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            since_improvement += 1
+            continue
+
+        if solver.ObjectiveValue() >= old_cost:
+            since_improvement += 1
+            continue
+
+        since_improvement = 0
+        for item, (item_start_var, _) in item_vars.items():
+            item_start[item] = solver.Value(item_start_var)
+        positions = item_start[item_of] + offset
+        order = np.argsort(item_start, kind="stable")
+        cost = cost_of(positions)
+
+        logger.debug(
+            "LNS iteration %d: objective %d after %.3f s",
+            iteration,
+            cost,
+            time.perf_counter() - start,
+        )
+
+        if callback is not None:
+            callback(
+                SolveResult(
+                    positions.tolist(),
+                    objective=cost,
+                    status="FEASIBLE",
+                    bound=bound,
+                    wall_time=time.perf_counter() - start,
+                )
+            )
+
+    if cancellation is not None:
+        cancellation.check()
+
+    return SolveResult(
+        positions.tolist(),
+        objective=cost,
+        status="OPTIMAL" if cost == bound else "FEASIBLE",
+        bound=bound,
+        wall_time=time.perf_counter() - start,
+        branches=total_branches,
+        conflicts=total_conflicts,
+    )
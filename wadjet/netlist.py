@@ -0,0 +1,225 @@
+import numpy as np
+
+from wadjet.components import Jumper
+from wadjet.optimise import DisjointSet
+
+
+class Netlist:
+    """
+    Components, pins and nets of a circuit, interned to integer ids. Arrays
+    indexed by pin id give its component (-1 for junctions), its leg number and
+    its strip (-1 if none). The strips are the nets, then the dummy strips of
+    stripsToPlace, then those added by insert_jumpers.
+    """
+
+    def __init__(self, component_list, connections):
+        self.components = list(component_list)
+        self.component_ids = {
+            component.name: i for i, component in enumerate(self.components)
+        }
+
+        self.pin_names = []
+        self.pin_ids = {}
+        sets = DisjointSet()
+
+        def intern(pin):
+            pin_id = self.pin_ids.get(pin)
+            if pin_id is None:
+                pin_id = self.pin_ids[pin] = sets.add()
+                self.pin_names.append(pin)
+            return pin_id
+
+        # Connected pins first, so that strips and their pins keep the order in
+        # which they appear in connections
+        for node, neighbors in connections.items():
+            if len(neighbors) == 0:
+                continue
+            node_id = intern(node)
+            for neighbor in neighbors:
+                sets.union(node_id, intern(neighbor))
+        num_connected = len(self.pin_names)
+
+        for node in connections:
+            intern(node)
+        num_mentioned = len(self.pin_names)
+
+        self.component_pins = []
+        for c in self.components:
+            legs = c.unique_leg_names()
+            if c.ic:
+                legs = legs[0] + legs[1]
+            pins = np.array([intern(name) for name in legs], dtype=np.int32)
+            self.component_pins.append(pins)
+
+        num_pins = len(self.pin_names)
+
+        self.pin_component = np.full(num_pins, -1, dtype=np.int32)
+        self.pin_leg = np.full(num_pins, -1, dtype=np.int32)
+        for component_id, pins in enumerate(self.component_pins):
+            self.pin_component[pins] = component_id
+            self.pin_leg[pins] = np.arange(len(pins), dtype=np.int32)
+
+        self.is_ic = np.array([c.ic for c in self.components], dtype=bool)
+
+        # Number the nets by the first pin in each
+        roots = np.array([sets.find(i) for i in range(num_connected)], dtype=np.int32)
+        _, first, net = np.unique(roots, return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.int32)
+        rank[np.argsort(first)] = np.arange(len(first), dtype=np.int32)
+
+        self.pin_strip = np.full(num_pins, -1, dtype=np.int32)
+        self.pin_strip[:num_connected] = rank[net.reshape(-1)]
+        self.num_nets = len(first)
+
+        # Dummy strips for IC pin pairs that are not mentioned in connections
+        num_strips = self.num_nets
+        for component_id in np.flatnonzero(self.is_ic):
+            c = self.components[component_id]
+            rows = c.unique_leg_names()
+            for leg1, leg2 in zip(rows[0], rows[1]):
+                pin1 = self.pin_ids[leg1]
+                if pin1 >= num_mentioned and self.pin_ids[leg2] >= num_mentioned:
+                    self.pin_strip[pin1] = num_strips
+                    num_strips += 1
+        self.num_strips = num_strips
+
+    @classmethod
+    def from_strips(cls, component_list, strips):
+        """
+        Returns the Netlist of component_list with the given strips of pin
+        names, such as those from stripsToPlace. Pins that belong to no
+        component are left out.
+        """
+
+        netlist = cls(component_list, {})
+
+        netlist.pin_strip[:] = -1
+        for strip_idx, strip in enumerate(strips):
+            for pin in strip:
+                pin_id = netlist.pin_ids.get(pin)
+                if pin_id is not None:
+                    netlist.pin_strip[pin_id] = strip_idx
+        netlist.num_nets = netlist.num_strips = len(strips)
+
+        return netlist
+
+    def insert_jumpers(self):
+        """
+        Moves each IC pin that shares a net with an earlier IC pin, of the
+        same IC or another, onto a strip of its own, joined to the net by a new
+        Jumper, as each strip can hold the pin of only one IC. Returns the
+        jumper names.
+        """
+
+        if not self.is_ic.any():
+            return []
+
+        ic_pins = np.flatnonzero(
+            (self.pin_component >= 0)
+            & self.is_ic[self.pin_component]
+            & (self.pin_strip >= 0)
+        )
+
+        # By strip, then IC, then pin id, so that the first IC pin on a strip
+        # stays there and is joined to the rest
+        ic_pins = ic_pins[
+            np.lexsort((ic_pins, self.pin_component[ic_pins], self.pin_strip[ic_pins]))
+        ]
+        strip = self.pin_strip[ic_pins]
+        first = np.ones(len(ic_pins), dtype=bool)
+        first[1:] = strip[1:] != strip[:-1]
+
+        run_start = np.maximum.accumulate(np.where(first, np.arange(len(ic_pins)), 0))
+        kept = ic_pins[run_start[~first]]
+        moved = ic_pins[~first]
+
+        num_jumpers = len(moved)
+        if num_jumpers == 0:
+            return []
+
+        num_pins = len(self.pin_names)
+        new_strips = self.num_strips + np.arange(num_jumpers, dtype=np.int32)
+
+        jumper_names = []
+        for i, (kept_pin, moved_pin) in enumerate(zip(kept, moved)):
+            jumper = Jumper(
+                f"jumper_{self.pin_names[kept_pin]}_{self.pin_names[moved_pin]}"
+            )
+            jumper_names.append(jumper.name)
+
+            self.component_ids[jumper.name] = len(self.components)
+            self.components.append(jumper)
+            pins = num_pins + 2 * i + np.arange(2, dtype=np.int32)
+            self.component_pins.append(pins)
+            for pin, name in zip(pins.tolist(), jumper.unique_leg_names()):
+                self.pin_ids[name] = pin
+                self.pin_names.append(name)
+
+        first_component = len(self.is_ic)
+        self.is_ic = np.append(self.is_ic, np.zeros(num_jumpers, dtype=bool))
+        self.pin_component = np.append(
+            self.pin_component,
+            np.repeat(
+                np.arange(first_component, first_component + num_jumpers), 2
+            ).astype(np.int32),
+        )
+        self.pin_leg = np.append(
+            self.pin_leg, np.tile(np.arange(2, dtype=np.int32), num_jumpers)
+        )
+
+        # The start of each jumper is on the net, and its end on the new strip
+        # with the pin that was moved off the net
+        jumper_strips = np.empty(2 * num_jumpers, dtype=np.int32)
+        jumper_strips[0::2] = self.pin_strip[kept]
+        jumper_strips[1::2] = new_strips
+        self.pin_strip[moved] = new_strips
+        self.pin_strip = np.append(self.pin_strip, jumper_strips)
+        self.num_strips += num_jumpers
+
+        return jumper_names
+
+    def __len__(self):
+        return len(self.pin_names)
+
+    def __repr__(self):
+        return (
+            f"Netlist({len(self.components)} components, {len(self)} pins, "
+            f"{self.num_strips} strips)"
+        )
+
+    def component_of(self, pin):
+        """
+        Returns the component that the pin name belongs to, or None.
+        """
+
+        component_id = self.pin_component[self.pin_ids[pin]]
+        return self.components[component_id] if component_id >= 0 else None
+
+    def strips(self):
+        """
+        Returns the pin names on each strip, as lists in strip order.
+        """
+
+        on_strip = np.flatnonzero(self.pin_strip >= 0)
+        order = on_strip[np.argsort(self.pin_strip[on_strip], kind="stable")]
+        bounds = np.searchsorted(
+            self.pin_strip[order], np.arange(self.num_strips + 1), side="left"
+        )
+        names = self.pin_names
+        return [
+            [names[pin] for pin in order[start:end]]
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def component_strips(self):
+        """
+        Returns sorted (component, strip) id arrays, one entry for each strip
+        that a component has a pin on.
+        """
+
+        on_strip = (self.pin_strip >= 0) & (self.pin_component >= 0)
+        keys = np.unique(
+            self.pin_component[on_strip].astype(np.int64) * max(1, self.num_strips)
+            + self.pin_strip[on_strip]
+        )
+        return keys // max(1, self.num_strips), keys % max(1, self.num_strips)
@@ -1,40 +1,392 @@
-import matplotlib as mpl
-
-mpl.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-
-rcParams["axes.facecolor"] = "FFFFFF"
-rcParams["savefig.facecolor"] = "FFFFFF"
-rcParams["xtick.direction"] = "in"
-rcParams["ytick.direction"] = "in"
-
-rcParams.update({"figure.autolayout": True})
-
-rcParams["figure.figsize"] = (16, 9)
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from ortools.sat.python import cp_model
 
-import networkx as nx
+from wadjet.instrument import logger
+
+# Instances with at least this many connections per strip are solved with the
+# ordering encoding, and the rest with intervals
+DENSE_MIN_DEGREE = 3
+
+# Instances up to this many strips are solved by exactPlacement rather than
+# CP-SAT, as from benchmarks/exact.py the dynamic program proves the optimum in
+# well under a second, where CP-SAT often takes seconds
+EXACT_MAX_STRIPS = 18
+
+
+class SolveResult:
+    """
+    Result of a placement solve. Iterating over it yields the index assigned to
+    each strip, so it can be used wherever the plain list of placements was.
+    """
+
+    def __init__(
+        self,
+        placements,
+        objective=None,
+        status=None,
+        hints_kept=None,
+        bound=None,
+        wall_time=None,
+        branches=None,
+        conflicts=None,
+        engine=None,
+    ):
+        self.placements = placements
+        self.objective = objective
+        self.status = status
+        # Fraction of hinted strips that kept their hinted index (None if no hint)
+        self.hints_kept = hints_kept
+        # Best lower bound on the objective proven by the solver
+        self.bound = bound
+        self.wall_time = wall_time
+        # Search statistics from CP-SAT, None for other engines
+        self.branches = branches
+        self.conflicts = conflicts
+        # Strategy that found the placement when racing several, and the
+        # outcome of each of them (see racePlacement)
+        self.engine = engine
+        self.portfolio = None
+
+    @property
+    def optimal(self):
+        return self.status == "OPTIMAL"
+
+    @property
+    def gap(self):
+        """
+        Relative gap between the objective and the proven bound, 0 if optimal.
+        """
+
+        if self.objective is None or self.bound is None:
+            return None
+        return (self.objective - self.bound) / max(1.0, abs(self.objective))
+
+    def statistics(self):
+        """
+        Returns the solver statistics as a dict, for logging or reporting.
+        """
+
+        return {
+            "status": self.status,
+            "objective": self.objective,
+            "bound": self.bound,
+            "wall_time": self.wall_time,
+            "branches": self.branches,
+            "conflicts": self.conflicts,
+            "engine": self.engine,
+        }
+
+    def __iter__(self):
+        return iter(self.placements)
+
+    def __len__(self):
+        return len(self.placements)
+
+    def __getitem__(self, i):
+        return self.placements[i]
+
+    def __repr__(self):
+        return f"SolveResult(objective={self.objective}, bound={self.bound}, status={self.status}, hints_kept={self.hints_kept})"
+
+
+class PlacementCancelled(RuntimeError):
+    """
+    Raised by a placement solve that was stopped through a Cancellation.
+    """
+
+
+class Cancellation:
+    """
+    Stops placement solves from another thread. Pass it to optimisePlacement
+    (or placeBoard) and call cancel(); the solves then raise
+    PlacementCancelled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._solvers = set()
+        self.cancelled = False
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            solvers = list(self._solvers)
+        for solver in solvers:
+            solver.StopSearch()
+
+    def check(self):
+        """
+        Raises PlacementCancelled if cancel has been called.
+        """
+
+        if self.cancelled:
+            raise PlacementCancelled("Placement cancelled")
+
+    def _add(self, solver):
+        with self._lock:
+            self._solvers.add(solver)
+
+    def _remove(self, solver):
+        with self._lock:
+            self._solvers.discard(solver)
+
+
+class _ProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Forwards each improving solution found during the search to callback, and
+    stops the search if cancellation has been cancelled.
+    """
+
+    def __init__(self, indices, callback, cancellation=None):
+        super().__init__()
+        self.indices = indices
+        self.callback = callback
+        self.cancellation = cancellation
+
+    def on_solution_callback(self):
+        # Covers a cancel that arrives just before the search starts
+        if self.cancellation is not None and self.cancellation.cancelled:
+            self.StopSearch()
+            return
+
+        if self.callback is None:
+            return
+
+        self.callback(
+            SolveResult(
+                [self.Value(index) for index in self.indices],
+                objective=self.ObjectiveValue(),
+                status="FEASIBLE",
+                bound=self.BestObjectiveBound(),
+                wall_time=self.WallTime(),
+            )
+        )
 
 
-def optimisePlacement(connected_pairs, sequential_groups):
+def optimisePlacement(
+    connected_pairs,
+    sequential_groups,
+    hint=None,
+    time_limit=None,
+    num_workers=None,
+    callback=None,
+    weights=None,
+    decompose=True,
+    symmetry_breaking=True,
+    encoding="auto",
+    cancellation=None,
+):
+    """
+    Finds the strip ordering that minimises the total connection length, and
+    returns a SolveResult.
+
+    hint maps strips to their index in a previous placement, as a warm start,
+    and weights maps connected pairs to the weight of their length. The best
+    placement found in time_limit seconds is returned (heuristicPlacement's if
+    there is none), and callback is called with each improving one. If
+    decompose is True, independent blocks of strips are solved in parallel,
+    sharing the time limit and the num_workers workers. symmetry_breaking rules
+    out mirror images and swaps of interchangeable strips. encoding is
+    "position", "interval", "ordering" (see chooseEncoding), "exact"
+    (exactPlacement) or "auto". cancellation, a Cancellation, stops the solve
+    from another thread, raising PlacementCancelled.
+    """
+
+    if cancellation is not None:
+        cancellation.check()
 
     if len(sequential_groups) == 0:
         sequential_groups = [[0]]
 
-    # Create a model.
-    model = cp_model.CpModel()
-
     # Number of strips
     num_strips = (
         max(
-            max(max(pair) for pair in connected_pairs),
+            max((max(pair) for pair in connected_pairs), default=-1),
             max(max(group) for group in sequential_groups),
         )
         + 1
     )
 
+    if decompose:
+        blocks = independentBlocks(connected_pairs, sequential_groups, num_strips)
+        if len(blocks) > 1:
+            return _optimiseBlocks(
+                blocks,
+                connected_pairs,
+                sequential_groups,
+                hint=hint,
+                time_limit=time_limit,
+                num_workers=num_workers,
+                callback=callback,
+                weights=weights,
+                symmetry_breaking=symmetry_breaking,
+                encoding=encoding,
+                cancellation=cancellation,
+            )
+
+    hint = {
+        strip: min(max(int(index), 0), num_strips - 1)
+        for strip, index in (hint or {}).items()
+        if 0 <= strip < num_strips
+    }
+
+    grouped = [strip for group in sequential_groups for strip in group]
+    groups_share_strips = len(set(grouped)) != len(grouped)
+
+    if encoding == "auto" and num_strips <= EXACT_MAX_STRIPS:
+        if not groups_share_strips:
+            encoding = "exact"
+
+    if encoding == "exact":
+        return exactPlacement(
+            connected_pairs,
+            sequential_groups,
+            num_strips=num_strips,
+            weights=weights,
+            hint=hint,
+            callback=callback,
+            cancellation=cancellation,
+        )
+
+    if encoding == "auto":
+        encoding = chooseEncoding(connected_pairs, sequential_groups, num_strips)
+
+    if encoding == "interval" and groups_share_strips:
+        # Groups sharing strips cannot be separate intervals
+        logger.debug("Sequential groups share strips, using the position encoding")
+        encoding = "position"
+
+    if encoding == "position":
+        model, indices = _positionModel(num_strips, sequential_groups)
+    elif encoding == "interval":
+        model, indices = _intervalModel(num_strips, sequential_groups, hint)
+    elif encoding == "ordering":
+        model, indices = _positionModel(num_strips, sequential_groups)
+    else:
+        raise ValueError(f"Unknown placement encoding {encoding}")
+
+    # Objective Function: Minimize total connection length.
+    abs_diff_vars = []
+    for pair in connected_pairs:
+        abs_diff = model.NewIntVar(
+            0, num_strips - 1, "abs_diff_{}_{}".format(pair[0], pair[1])
+        )
+        abs_diff_vars.append(abs_diff)
+
+        if encoding == "ordering":
+            # A Boolean for which strip of the pair comes first, which fixes
+            # the sign of the difference
+            first = model.NewBoolVar("before_{}_{}".format(pair[0], pair[1]))
+            difference = indices[pair[1]] - indices[pair[0]]
+            model.Add(abs_diff == difference).OnlyEnforceIf(first)
+            model.Add(abs_diff == -difference).OnlyEnforceIf(first.Not())
+            if pair[0] in hint and pair[1] in hint:
+                model.AddHint(first, hint[pair[0]] < hint[pair[1]])
+        else:
+            # This creates the absolute difference.
+            model.AddAbsEquality(abs_diff, indices[pair[0]] - indices[pair[1]])
+
+    if weights is not None:
+        abs_diff_vars = [
+            weights.get(tuple(pair), 1) * abs_diff
+            for pair, abs_diff in zip(connected_pairs, abs_diff_vars)
+        ]
+
+    model.Minimize(sum(abs_diff_vars))
+
+    # Warm start from a previous placement
+    if encoding != "interval":
+        for strip, index in hint.items():
+            model.AddHint(indices[strip], index)
+
+    if symmetry_breaking:
+        for s1, s2 in symmetryBreakingPairs(
+            connected_pairs, sequential_groups, num_strips, weights, hint
+        ):
+            model.Add(indices[s1] < indices[s2])
+
+    # Solve
+    solver = cp_model.CpSolver()
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+
+    if cancellation is not None:
+        cancellation._add(solver)
+    try:
+        if callback is not None or cancellation is not None:
+            status = solver.Solve(
+                model, _ProgressCallback(indices, callback, cancellation)
+            )
+        else:
+            status = solver.Solve(model)
+    finally:
+        if cancellation is not None:
+            cancellation._remove(solver)
+
+    if cancellation is not None:
+        cancellation.check()
+
+    if status == cp_model.UNKNOWN:
+        # Out of time before CP-SAT found any placement. The heuristic always
+        # finds one (it imports this module, so is imported here)
+        from wadjet.heuristic import heuristicPlacement
+
+        logger.debug("No placement found in time, using heuristicPlacement")
+        return heuristicPlacement(
+            connected_pairs,
+            sequential_groups,
+            weights=weights,
+            time_limit=0,
+            callback=callback,
+            cancellation=cancellation,
+        )
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise RuntimeError(f"No feasible placement found ({solver.StatusName(status)})")
+
+    logger.debug(
+        "Objective value = %s (bound %s after %.3f s, %s)",
+        solver.ObjectiveValue(),
+        solver.BestObjectiveBound(),
+        solver.WallTime(),
+        solver.StatusName(status),
+    )
+
+    placements = [solver.Value(index) for index in indices]
+
+    hints_kept = None
+    if len(hint) > 0:
+        kept = sum(1 for strip, index in hint.items() if placements[strip] == index)
+        hints_kept = kept / len(hint)
+
+    return SolveResult(
+        placements,
+        objective=solver.ObjectiveValue(),
+        status=solver.StatusName(status),
+        hints_kept=hints_kept,
+        bound=solver.BestObjectiveBound(),
+        wall_time=solver.WallTime(),
+        branches=solver.NumBranches(),
+        conflicts=solver.NumConflicts(),
+    )
+
+
+def _positionModel(num_strips, sequential_groups):
+    """
+    One integer index per strip, all different, with the strips of each
+    sequential group consecutive.
+    """
+
+    model = cp_model.CpModel()
+
     # Variables
     indices = [
         model.NewIntVar(0, num_strips - 1, "index_{}".format(i))
@@ -49,35 +401,531 @@ def optimisePlacement(connected_pairs, sequential_groups):
         for i in range(len(group) - 1):
             model.Add(indices[group[i]] + 1 == indices[group[i + 1]])
 
-    # Objective Function: Minimize total connection length.
-    abs_diff_vars = []
+    return model, indices
+
+
+def _intervalModel(num_strips, sequential_groups, hint):
+    """
+    One fixed-length interval per sequential group and per remaining strip,
+    with no two overlapping. The index of each strip is the start of its
+    interval plus its place in the group, so groups need no extra constraints.
+    The groups must not share strips.
+    """
+
+    groups = [list(group) for group in sequential_groups if len(group) > 0]
+    grouped = {strip for group in groups for strip in group}
+    groups += [[strip] for strip in range(num_strips) if strip not in grouped]
+
+    model = cp_model.CpModel()
+
+    indices = [None] * num_strips
+    intervals = []
+    for group in groups:
+        start = model.NewIntVar(0, num_strips - len(group), "start_{}".format(group[0]))
+        intervals.append(
+            model.NewFixedSizeIntervalVar(
+                start, len(group), "interval_{}".format(group[0])
+            )
+        )
+        for offset, strip in enumerate(group):
+            indices[strip] = start + offset
+
+        if group[0] in hint:
+            model.AddHint(start, min(hint[group[0]], num_strips - len(group)))
+
+    model.AddNoOverlap(intervals)
+
+    return model, indices
+
+
+def chooseEncoding(connected_pairs, sequential_groups, num_strips):
+    """
+    Picks the model encoding expected to find the best placement within a time
+    limit, from the density of connections.
+
+    Above EXACT_MAX_STRIPS strips no encoding proves optimality within seconds
+    in benchmarks/encodings.py. With three or more connections per strip, the
+    ordering encoding finds the best placements, often by a fifth or more;
+    with fewer, no encoding is reliably better, and intervals are used.
+    """
+
+    mean_degree = 2 * len(connected_pairs) / max(1, num_strips)
+
+    if mean_degree >= DENSE_MIN_DEGREE:
+        return "ordering"
+    return "interval"
+
+
+def _subsetSums(values):
+    """
+    Returns the sum of the values in every subset, indexed by the bitmask of
+    the subset.
+    """
+
+    sums = np.zeros(1, dtype=np.int64)
+    for value in values:
+        sums = np.concatenate([sums, sums + value])
+    return sums
+
+
+def exactPlacement(
+    connected_pairs,
+    sequential_groups,
+    num_strips=None,
+    weights=None,
+    hint=None,
+    callback=None,
+    cancellation=None,
+):
+    """
+    Finds an optimal strip ordering without CP-SAT, by dynamic programming over
+    the sets of items (sequential groups, which must not share strips, or lone
+    strips) placed first, in time and memory exponential in the number of
+    strips. Of the optimal orderings, the one keeping the most of hint is
+    returned. The arguments are as for optimisePlacement.
+    """
+
+    start = time.perf_counter()
+
+    if cancellation is not None:
+        cancellation.check()
+
+    groups = [list(group) for group in sequential_groups if len(group) > 0]
+    if num_strips is None:
+        num_strips = (
+            max(
+                max((max(pair) for pair in connected_pairs), default=-1),
+                max((max(group) for group in groups), default=-1),
+            )
+            + 1
+        )
+
+    grouped = [strip for group in groups for strip in group]
+    if len(set(grouped)) != len(grouped):
+        raise ValueError("Sequential groups share strips")
+    grouped = set(grouped)
+    items = groups + [[strip] for strip in range(num_strips) if strip not in grouped]
+    num_items = len(items)
+
+    adjacency = np.zeros((num_strips, num_strips), dtype=np.int64)
     for pair in connected_pairs:
-        abs_diff = model.NewIntVar(
-            0, num_strips - 1, "abs_diff_{}_{}".format(pair[0], pair[1])
+        s1, s2 = pair
+        if s1 != s2:
+            weight = weights.get(tuple(pair), 1) if weights is not None else 1
+            adjacency[s1, s2] += weight
+            adjacency[s2, s1] += weight
+    degree = adjacency.sum(axis=1)
+
+    # Weight of the connections crossing the gap after each set of strips
+    cut = np.zeros(1 << num_strips, dtype=np.int64)
+    for strip in range(num_strips):
+        below = 1 << strip
+        cut[below : 2 * below] = (
+            cut[:below] + degree[strip] - 2 * _subsetSums(adjacency[strip, :strip])
         )
-        abs_diff_vars.append(abs_diff)
 
-        # This creates the absolute difference.
-        model.AddAbsEquality(abs_diff, indices[pair[0]] - indices[pair[1]])
+    # Strips in, and number of places taken by, each set of items
+    item_masks = [sum(1 << strip for strip in item) for item in items]
+    strips_in = _subsetSums(item_masks)
+    placed = _subsetSums([len(item) for item in items])
+    num_items_in = _subsetSums([1] * num_items)
+
+    # Ties are broken towards the hint by counting strips away from their hinted
+    # index, in units smaller than one of connection length
+    hint = hint or {}
+    scale = num_strips + 1 if len(hint) > 0 else 1
+    misplaced = np.zeros((num_items, num_strips + 1), dtype=np.int64)
+    for i, item in enumerate(items):
+        for offset, strip in enumerate(item):
+            if strip in hint:
+                misplaced[i] += np.arange(num_strips + 1) + offset != hint[strip]
+
+    best = np.full(1 << num_items, np.iinfo(np.int64).max, dtype=np.int64)
+    best[0] = 0
+    choice = np.full(1 << num_items, -1, dtype=np.int8)
+
+    subsets = np.argsort(num_items_in, kind="stable")
+    layers = np.cumsum(np.bincount(num_items_in, minlength=num_items + 1))
+    for layer in range(num_items):
+        if cancellation is not None:
+            cancellation.check()
+
+        before = subsets[(layers[layer - 1] if layer > 0 else 0) : layers[layer]]
+        for i, item in enumerate(items):
+            sets = before[(before >> i) & 1 == 0]
+            strips_before = strips_in[sets]
+
+            # The gaps after each strip of the item
+            score = np.zeros(len(sets), dtype=np.int64)
+            prefix = 0
+            for strip in item:
+                prefix |= 1 << strip
+                score += cut[strips_before | prefix]
+            score = best[sets] + score * scale + misplaced[i, placed[sets]]
+
+            after = sets | (1 << i)
+            better = score < best[after]
+            best[after[better]] = score[better]
+            choice[after[better]] = i
+
+    # Items from last to first
+    order = []
+    remaining = (1 << num_items) - 1
+    while remaining > 0:
+        i = int(choice[remaining])
+        order.append(i)
+        remaining ^= 1 << i
+
+    placements = [0] * num_strips
+    index = 0
+    for i in reversed(order):
+        for strip in items[i]:
+            placements[strip] = index
+            index += 1
+
+    objective = float(best[-1] // scale)
+
+    hints_kept = None
+    if len(hint) > 0:
+        kept = sum(1 for strip, index in hint.items() if placements[strip] == index)
+        hints_kept = kept / len(hint)
+
+    result = SolveResult(
+        placements,
+        objective=objective,
+        status="OPTIMAL",
+        hints_kept=hints_kept,
+        bound=objective,
+        wall_time=time.perf_counter() - start,
+    )
 
-    model.Minimize(sum(abs_diff_vars))
+    logger.debug(
+        "Exact objective value = %s for %d strips after %.3f s",
+        objective,
+        num_strips,
+        result.wall_time,
+    )
 
-    # Solve
-    solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    if callback is not None:
+        callback(result)
 
-    if status == cp_model.OPTIMAL:
-        print("Objective value =", solver.ObjectiveValue())
-        # for i in range(num_strips):
-        # print('Strip', i, 'has index', solver.Value(indices[i]))
-    else:
-        print("The problem does not have an optimal solution.")
-        exit(0)
+    return result
+
+
+class DisjointSet:
+    """
+    Union-find over the integers 0, 1, ..., with path halving and union by size.
+    """
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def add(self):
+        """
+        Adds a new singleton set and returns its id.
+        """
+
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+
+    def __len__(self):
+        return len(self.parent)
+
+
+def independentBlocks(connected_pairs, sequential_groups, num_strips):
+    """
+    Returns lists of strip indices that can be ordered independently of each
+    other, as no connected pair or sequential group spans two of them.
+    """
+
+    sets = DisjointSet(num_strips)
+
+    for s1, s2 in connected_pairs:
+        sets.union(s1, s2)
 
-    return [solver.Value(indices[i]) for i in range(num_strips)]
+    for group in sequential_groups:
+        for s1, s2 in zip(group[:-1], group[1:]):
+            sets.union(s1, s2)
+
+    blocks = defaultdict(list)
+    for i in range(num_strips):
+        blocks[sets.find(i)].append(i)
+
+    return sorted(blocks.values(), key=lambda block: block[0])
+
+
+def interchangeableStrips(connected_pairs, sequential_groups, num_strips, weights=None):
+    """
+    Returns lists of strips that can be permuted among themselves in any
+    ordering without changing the objective, as each has the same weighted
+    connections to every other strip. Strips in sequential groups are never
+    interchangeable.
+    """
+
+    neighbours = [{} for _ in range(num_strips)]
+    for pair in connected_pairs:
+        weight = weights.get(tuple(pair), 1) if weights is not None else 1
+        s1, s2 = pair
+        neighbours[s1][s2] = neighbours[s1].get(s2, 0) + weight
+        neighbours[s2][s1] = neighbours[s2].get(s1, 0) + weight
+
+    grouped = {
+        strip for group in sequential_groups if len(group) > 1 for strip in group
+    }
+
+    def swappable(s1, s2):
+        # Swapping s1 and s2 leaves every connection length the same
+        n1 = {k: w for k, w in neighbours[s1].items() if k != s2}
+        n2 = {k: w for k, w in neighbours[s2].items() if k != s1}
+        return n1 == n2
+
+    # Candidates have the same neighbours, either not counting themselves (if
+    # they are not connected to each other) or counting themselves (if they are)
+    buckets = defaultdict(list)
+    for strip in range(num_strips):
+        if strip not in grouped:
+            open_neighbours = frozenset(neighbours[strip])
+            buckets[(False, open_neighbours)].append(strip)
+            buckets[(True, open_neighbours | {strip})].append(strip)
+
+    # Any two strips joined by a chain of swaps can be permuted freely
+    sets = DisjointSet(num_strips)
+    for bucket in buckets.values():
+        for i, s1 in enumerate(bucket):
+            for s2 in bucket[i + 1 :]:
+                if sets.find(s1) != sets.find(s2) and swappable(s1, s2):
+                    sets.union(s1, s2)
+
+    classes = defaultdict(list)
+    for strip in range(num_strips):
+        classes[sets.find(strip)].append(strip)
+
+    return [c for c in classes.values() if len(c) > 1]
+
+
+def symmetryBreakingPairs(
+    connected_pairs, sequential_groups, num_strips, weights=None, hint=None
+):
+    """
+    Returns pairs (s1, s2) of strips such that requiring s1 to be placed before
+    s2, for every pair, keeps at least one optimal ordering.
+
+    Interchangeable strips are placed in a fixed order, and, if no sequential
+    group fixes the direction of the ordering, two other strips are placed in a
+    fixed order to rule out mirror images. The orders follow the hint, if there
+    is one, so that a hinted placement is never ruled out.
+    """
+
+    hint = hint or {}
+
+    def hinted_order(strips):
+        return sorted(strips, key=lambda s: (s not in hint, hint.get(s, 0), s))
+
+    pairs = []
+
+    interchangeable = interchangeableStrips(
+        connected_pairs, sequential_groups, num_strips, weights
+    )
+    for strips in interchangeable:
+        strips = hinted_order(strips)
+        pairs.extend(zip(strips[:-1], strips[1:]))
+
+    # Reversing an ordering keeps every connection length, but not the order
+    # within a sequential group
+    if all(len(group) < 2 for group in sequential_groups):
+        permuted = {strip for strips in interchangeable for strip in strips}
+        fixed = [strip for strip in range(num_strips) if strip not in permuted]
+        if len(fixed) >= 2:
+            pairs.append(tuple(hinted_order(fixed[:1] + fixed[-1:])))
+
+    return pairs
+
+
+def _optimiseBlocks(
+    blocks,
+    connected_pairs,
+    sequential_groups,
+    hint=None,
+    weights=None,
+    num_workers=None,
+    callback=None,
+    time_limit=None,
+    **options,
+):
+    """
+    Orders each independent block separately in a thread pool (CP-SAT releases
+    the GIL while solving), then places the blocks one after the other.
+
+    The num_workers search workers (one per core by default) are shared out
+    between the blocks solved at once, and each block gets the time left of
+    time_limit when it starts. Once every block has a solution, callback is
+    called with the full placement whenever a block improves.
+    """
+
+    start = time.perf_counter()
+    deadline = start + time_limit if time_limit is not None else None
+
+    num_workers = num_workers or os.cpu_count() or 1
+    num_threads = min(len(blocks), num_workers)
+    block_workers = max(1, num_workers // num_threads)
+
+    block_of = {}
+    local_index = {}
+    for b, block in enumerate(blocks):
+        for i, strip in enumerate(block):
+            block_of[strip] = b
+            local_index[strip] = i
+
+    block_pairs = [[] for _ in blocks]
+    block_weights = [{} for _ in blocks]
+    for pair in connected_pairs:
+        b = block_of[pair[0]]
+        local_pair = (local_index[pair[0]], local_index[pair[1]])
+        block_pairs[b].append(local_pair)
+        if weights is not None:
+            block_weights[b][local_pair] = weights.get(tuple(pair), 1)
+
+    block_groups = [[] for _ in blocks]
+    for group in sequential_groups:
+        if len(group) > 0:
+            block_groups[block_of[group[0]]].append([local_index[s] for s in group])
+
+    # Hinted indices are turned into ranks within each block
+    block_hints = [{} for _ in blocks]
+    for strip, index in sorted((hint or {}).items(), key=lambda h: h[1]):
+        if strip in block_of:
+            b = block_of[strip]
+            block_hints[b][local_index[strip]] = len(block_hints[b])
+
+    def concatenate(results):
+        placements = [0] * sum(len(block) for block in blocks)
+        offset = 0
+        for block, result in zip(blocks, results):
+            for i, strip in enumerate(block):
+                placements[strip] = offset + result.placements[i]
+            offset += len(block)
+        return placements
+
+    # The best solution of each block so far, for reporting full placements
+    lock = threading.Lock()
+    best = [None] * len(blocks)
+    reported = [None]
+
+    def improved(b, result):
+        with lock:
+            if best[b] is not None and result.objective >= best[b].objective:
+                return
+            best[b] = result
+            if callback is None or any(r is None for r in best):
+                return
+            objective = sum(r.objective for r in best)
+            if reported[0] is not None and objective >= reported[0]:
+                return
+            reported[0] = objective
+            callback(
+                SolveResult(
+                    concatenate(best),
+                    objective=objective,
+                    status="FEASIBLE",
+                    bound=sum(r.bound for r in best if r.bound is not None),
+                    wall_time=time.perf_counter() - start,
+                )
+            )
+
+    def solve(b):
+        if len(blocks[b]) == 1:
+            # A lone strip has nowhere else to go
+            result = SolveResult(
+                [0],
+                objective=0,
+                status="OPTIMAL",
+                hints_kept=1.0 if block_hints[b] else None,
+                bound=0,
+            )
+        elif deadline is not None and time.perf_counter() >= deadline:
+            # Blocks that start after the deadline are placed by the heuristic
+            # (which imports this module, so is imported here)
+            from wadjet.heuristic import heuristicPlacement
+
+            result = heuristicPlacement(
+                block_pairs[b],
+                block_groups[b],
+                weights=block_weights[b] if weights is not None else None,
+                time_limit=0,
+                cancellation=options.get("cancellation"),
+            )
+        else:
+            result = optimisePlacement(
+                block_pairs[b],
+                block_groups[b],
+                hint=block_hints[b] if hint is not None else None,
+                weights=block_weights[b] if weights is not None else None,
+                decompose=False,
+                num_workers=block_workers,
+                callback=lambda r: improved(b, r),
+                time_limit=(
+                    deadline - time.perf_counter() if deadline is not None else None
+                ),
+                **options,
+            )
+        improved(b, result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = list(executor.map(solve, range(len(blocks))))
+
+    placements = concatenate(results)
+
+    hints_kept = None
+    hinted = [(r.hints_kept, len(h)) for r, h in zip(results, block_hints) if h]
+    if hint is not None and len(hinted) > 0:
+        hints_kept = sum(k * n for k, n in hinted) / sum(n for _, n in hinted)
+
+    optimal = all(result.optimal for result in results)
+
+    def total(statistic):
+        values = [getattr(result, statistic) for result in results]
+        values = [value for value in values if value is not None]
+        return sum(values) if len(values) > 0 else None
+
+    return SolveResult(
+        placements,
+        objective=sum(result.objective for result in results),
+        status="OPTIMAL" if optimal else "FEASIBLE",
+        hints_kept=hints_kept,
+        bound=sum(result.bound for result in results),
+        wall_time=time.perf_counter() - start,
+        branches=total("branches"),
+        conflicts=total("conflicts"),
+    )
 
 
-def connectedComponentStrips(connections):
+def exportConnectionGraph(connections, graph_file):
+    """
+    Writes the connection graph to graph_file for debugging, as GraphML if it
+    ends in .graphml and otherwise as a NetworkX drawing.
+    """
+
+    import networkx as nx
 
     G = nx.Graph()
 
@@ -85,14 +933,54 @@ def connectedComponentStrips(connections):
         for neighbor in neighbors:
             G.add_edge(node, neighbor)
 
-    nx.draw_networkx(G)
-    plt.savefig("circuit_graph.pdf")
-    plt.clf()
+    if graph_file.endswith(".graphml"):
+        nx.write_graphml(G, graph_file)
+        return
+
+    import matplotlib as mpl
+
+    mpl.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # Use a figure of our own rather than the pyplot current figure
+    fig, ax = plt.subplots()
+    nx.draw_networkx(G, ax=ax)
+    fig.savefig(graph_file)
+    plt.close(fig)
+
+
+def connectedComponentStrips(connections, graph_file=None):
+    """
+    Returns the connected components of the connection graph as lists of pins,
+    in order of first appearance. The graph is exported to graph_file, if it is
+    given, with exportConnectionGraph.
+    """
+
+    if graph_file is not None:
+        exportConnectionGraph(connections, graph_file)
+
+    # Intern each pin to an integer id, and union the ids of connected pins
+    pin_ids = {}
+    sets = DisjointSet()
+
+    def intern(pin):
+        pin_id = pin_ids.get(pin)
+        if pin_id is None:
+            pin_id = pin_ids[pin] = sets.add()
+        return pin_id
+
+    for node, neighbors in connections.items():
+        if len(neighbors) == 0:
+            continue
+        node_id = intern(node)
+        for neighbor in neighbors:
+            sets.union(node_id, intern(neighbor))
 
-    S = [G.subgraph(c).copy() for c in nx.connected_components(G)]
-    strips = [list(s.nodes) for s in S]
+    strips = defaultdict(list)
+    for pin, pin_id in pin_ids.items():
+        strips[sets.find(pin_id)].append(pin)
 
-    return strips
+    return list(strips.values())
 
 
 if __name__ == "__main__":
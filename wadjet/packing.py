@@ -0,0 +1,81 @@
+import heapq
+
+import numpy as np
+
+
+def stripExtents(netlist, component_columns):
+    """
+    Returns arrays of the first and last column of the component legs on each
+    strip of a Netlist, with -1 for strips that have none. component_columns
+    maps component names to their (first, last) columns; legs of components
+    that are not in it are not counted.
+    """
+
+    first_column = np.full(len(netlist.components), -1, dtype=np.int64)
+    last_column = np.full(len(netlist.components), -1, dtype=np.int64)
+    for name, (first, last) in component_columns.items():
+        component_id = netlist.component_ids[name]
+        first_column[component_id] = first
+        last_column[component_id] = last
+
+    pins = np.flatnonzero((netlist.pin_strip >= 0) & (netlist.pin_component >= 0))
+    pins = pins[first_column[netlist.pin_component[pins]] >= 0]
+    strips = netlist.pin_strip[pins]
+
+    big = np.iinfo(np.int64).max
+    first = np.full(netlist.num_strips, big, dtype=np.int64)
+    last = np.full(netlist.num_strips, -1, dtype=np.int64)
+    np.minimum.at(first, strips, first_column[netlist.pin_component[pins]])
+    np.maximum.at(last, strips, last_column[netlist.pin_component[pins]])
+    first[first == big] = -1
+
+    return first, last
+
+
+def packStrips(first, last, exclusive=None):
+    """
+    Packs strips whose column extents are at least one hole apart onto shared
+    rows, greedily by first column, with no row having more than one exclusive
+    strip. Returns the row of each strip, the number of rows, and the cuts as
+    (column, row).
+    """
+
+    num_strips = len(first)
+    if exclusive is None:
+        exclusive = np.zeros(num_strips, dtype=bool)
+
+    row_of_strip = np.full(num_strips, -1, dtype=np.int64)
+    last_on_row = []
+    row_exclusive = []
+    cuts = []
+
+    # Rows that can take any strip, and rows that already have an exclusive
+    # strip, as heaps of (last column, row)
+    open_rows = []
+    exclusive_rows = []
+
+    for strip in np.argsort(first, kind="stable").tolist():
+        row = None
+        if first[strip] >= 0:
+            heaps = [open_rows] if exclusive[strip] else [exclusive_rows, open_rows]
+            for heap in heaps:
+                if len(heap) > 0 and heap[0][0] + 1 < first[strip]:
+                    _, row = heapq.heappop(heap)
+                    break
+
+        if row is None:
+            row = len(last_on_row)
+            last_on_row.append(last[strip])
+            row_exclusive.append(False)
+        else:
+            cuts.append((int(last_on_row[row]) + 1, row))
+            last_on_row[row] = last[strip]
+
+        row_of_strip[strip] = row
+        row_exclusive[row] = row_exclusive[row] or bool(exclusive[strip])
+
+        if first[strip] >= 0:
+            heap = exclusive_rows if row_exclusive[row] else open_rows
+            heapq.heappush(heap, (int(last[strip]), row))
+
+    return row_of_strip, len(last_on_row), cuts
@@ -0,0 +1,216 @@
+import math
+import multiprocessing
+import queue
+import threading
+import time
+
+from wadjet.heuristic import heuristicPlacement
+from wadjet.instrument import logger
+from wadjet.optimise import Cancellation, PlacementCancelled, optimisePlacement
+
+# Strategies raced by default, as (name, engine, options)
+PORTFOLIO = (
+    ("cp-sat-interval", "cp-sat", {"encoding": "interval"}),
+    ("cp-sat-position", "cp-sat", {"encoding": "position"}),
+    ("cp-sat-ordering", "cp-sat", {"encoding": "ordering"}),
+    ("heuristic", "heuristic", {}),
+)
+
+# Seconds the losers get to stop after the deadline before they are killed
+STOP_GRACE = 1.0
+
+
+def _raceWorker(
+    name,
+    engine,
+    options,
+    connected_pairs,
+    sequential_groups,
+    weights,
+    hint,
+    time_limit,
+    incumbent,
+    bound,
+    stop,
+    messages,
+):
+    """
+    Runs one strategy of racePlacement, sending ("solution", name, result) for
+    each placement that improves on the shared incumbent, and ("done", name,
+    result or None, error or None) when it finishes.
+    """
+
+    cancellation = Cancellation()
+
+    # stop is polled rather than an Event, as setting an Event waits for every
+    # process waiting on it, which hangs if one of them has exited
+    def watch():
+        while not stop.value:
+            time.sleep(0.02)
+        cancellation.cancel()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+    def publish(result):
+        with bound.get_lock():
+            if result.bound is not None and result.bound > bound.value:
+                bound.value = result.bound
+        with incumbent.get_lock():
+            improved = result.objective < incumbent.value
+            if improved:
+                incumbent.value = result.objective
+        if improved:
+            messages.put(("solution", name, result))
+
+    try:
+        if engine == "cp-sat":
+            result = optimisePlacement(
+                connected_pairs,
+                sequential_groups,
+                hint=hint,
+                time_limit=time_limit,
+                callback=publish,
+                weights=weights,
+                cancellation=cancellation,
+                **options,
+            )
+        elif engine == "heuristic":
+            result = heuristicPlacement(
+                connected_pairs,
+                sequential_groups,
+                weights=weights,
+                time_limit=time_limit,
+                callback=publish,
+                cancellation=cancellation,
+                **options,
+            )
+        else:
+            raise ValueError(f"Unknown placement engine {engine}")
+    except PlacementCancelled:
+        messages.put(("done", name, None, "cancelled"))
+    except Exception as error:
+        messages.put(("done", name, None, f"{type(error).__name__}: {error}"))
+    else:
+        publish(result)
+        messages.put(("done", name, result, None))
+
+
+def racePlacement(
+    connected_pairs,
+    sequential_groups,
+    deadline=2.0,
+    strategies=None,
+    weights=None,
+    hint=None,
+    solve_fraction=0.9,
+    cancellation=None,
+):
+    """
+    Races strategies of (name, engine, options), PORTFOLIO by default, in
+    separate processes, sharing the best objective and bound, and returns the
+    best SolveResult found within deadline seconds. The winner is its engine,
+    and the outcome of each strategy is kept as its portfolio.
+    """
+
+    strategies = PORTFOLIO if strategies is None else strategies
+    sequential_groups = [list(group) for group in sequential_groups]
+
+    context = multiprocessing.get_context()
+    incumbent = context.Value("d", math.inf)
+    bound = context.Value("d", -math.inf)
+    stop = context.RawValue("b", 0)
+    messages = context.Queue()
+
+    start = time.monotonic()
+    end = start + deadline
+
+    processes = {}
+    for name, engine, options in strategies:
+        process = context.Process(
+            target=_raceWorker,
+            args=(
+                name,
+                engine,
+                options,
+                connected_pairs,
+                sequential_groups,
+                weights,
+                hint,
+                deadline * solve_fraction,
+                incumbent,
+                bound,
+                stop,
+                messages,
+            ),
+            daemon=True,
+        )
+        process.start()
+        processes[name] = process
+
+    best = None
+    best_engine = None
+    outcomes = {name: {"status": "UNKNOWN"} for name in processes}
+    proven = False
+
+    try:
+        while any(outcome["status"] == "UNKNOWN" for outcome in outcomes.values()):
+            now = time.monotonic()
+            if now > end + STOP_GRACE:
+                break
+            if now > end or proven:
+                stop.value = 1
+            if cancellation is not None and cancellation.cancelled:
+                stop.value = 1
+                break
+
+            try:
+                message = messages.get(timeout=0.02)
+            except queue.Empty:
+                continue
+
+            kind, name, result = message[:3]
+            if kind == "done":
+                error = message[3]
+                outcomes[name] = {
+                    "status": result.status if result is not None else "STOPPED",
+                    "objective": result.objective if result is not None else None,
+                    "error": error,
+                }
+            if result is None:
+                continue
+
+            if best is None or result.objective < best.objective:
+                best, best_engine = result, name
+            if result.optimal or best.objective <= bound.value + 1e-9:
+                proven = True
+
+    finally:
+        stop.value = 1
+        for process in processes.values():
+            process.join(timeout=max(0.0, end + STOP_GRACE - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    if cancellation is not None:
+        cancellation.check()
+
+    if best is None:
+        raise RuntimeError(f"No strategy found a placement ({outcomes})")
+
+    best.engine = best_engine
+    best.portfolio = outcomes
+    if best.objective <= bound.value + 1e-9:
+        best.status = "OPTIMAL"
+    if best.bound is None or bound.value > best.bound:
+        best.bound = bound.value
+
+    logger.debug(
+        "Portfolio won by %s with objective %s after %.3f s (%s)",
+        best_engine,
+        best.objective,
+        time.monotonic() - start,
+        outcomes,
+    )
+
+    return best
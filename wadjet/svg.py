@@ -0,0 +1,217 @@
+import string
+from xml.sax.saxutils import escape
+
+
+def row_label(y):
+    """
+    Returns the letter label of row y: A to Z, then AA, AB, and so on.
+    """
+
+    label = ""
+    y += 1
+    while y > 0:
+        y, remainder = divmod(y - 1, 26)
+        label = string.ascii_uppercase[remainder] + label
+    return label
+
+
+def _num(value):
+    # Fixed formatting, so the same board always gives the same bytes
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class SVGStripboard:
+    """
+    Stripboard with the same drawing API as graphics.Stripboard, that builds SVG
+    (or a plain text grid) directly from strings without matplotlib.
+
+    Items are only recorded when added, and the output is built by to_svg or
+    to_text, so the same placement always gives byte-identical output.
+    """
+
+    # Pixels per hole
+    unit = 40
+
+    def __init__(self, N):
+        self.N = N
+        self.strip_height = 0.8
+
+        self._components = []
+        self._ics = []
+        self._breaks = []
+
+    def add_component(self, start, end, color="red", name=None):
+        self._components.append((start, end, color, name))
+
+    def add_ic(self, start, size, name=None):
+        x, y = start
+        self._ics.append((start, size, name))
+        self.add_break(col=x, between=(y + 0 - 1, y + size // 2))
+
+    def add_break(self, col, between):
+        self._breaks.append((col, between))
+
+    def _x(self, x):
+        # Board x to SVG x, leaving one unit of margin for the labels
+        return _num((x + 1) * self.unit)
+
+    def _y(self, y):
+        # Board y runs up from the bottom, SVG y runs down from the top
+        return _num((self.N + 1 - y) * self.unit)
+
+    def _text(self, x, y, text, size, anchor="middle", rotate=False, bold=False):
+        attributes = (
+            f'x="{self._x(x)}" y="{self._y(y)}" font-size="{_num(size)}" '
+            f'text-anchor="{anchor}" dominant-baseline="central"'
+        )
+        if bold:
+            attributes += ' font-weight="bold"'
+        if rotate:
+            attributes += f' transform="rotate(-90 {self._x(x)} {self._y(y)})"'
+        return f"<text {attributes}>{escape(str(text))}</text>"
+
+    def to_svg(self):
+        unit = self.unit
+        size = _num((self.N + 2) * unit)
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" '
+            f'height="{size}" viewBox="0 0 {size} {size}">',
+            f'<rect width="{size}" height="{size}" fill="#ffffff"/>',
+        ]
+
+        # Conductive strips
+        gap = (1 - self.strip_height) / 2
+        parts.append('<g fill="#000000" fill-opacity="0.25">')
+        parts.extend(
+            f'<rect x="{self._x(0)}" y="{self._y(y + 1 - gap)}" '
+            f'width="{_num(self.N * unit)}" height="{_num(self.strip_height * unit)}"/>'
+            for y in range(self.N)
+        )
+        parts.append("</g>")
+
+        # Holes
+        parts.append('<g fill="#ffffff">')
+        parts.extend(
+            f'<circle cx="{self._x(x + 0.5)}" cy="{self._y(y + 0.5)}" '
+            f'r="{_num(0.2 * unit)}"/>'
+            for y in range(self.N)
+            for x in range(self.N)
+        )
+        parts.append("</g>")
+
+        # Column and row labels
+        for x in range(self.N):
+            parts.append(self._text(x + 0.5, -0.5, x + 1, 16, bold=True))
+            parts.append(self._text(x + 0.5, self.N + 0.5, x + 1, 16, bold=True))
+        for y in range(self.N):
+            parts.append(self._text(-0.5, y + 0.5, row_label(y), 16, bold=True))
+            parts.append(self._text(self.N + 0.5, y + 0.5, row_label(y), 16, bold=True))
+
+        # ICs
+        for (x, y), ic_size, name in self._ics:
+            parts.append(
+                f'<rect x="{self._x(x - 0.5)}" y="{self._y(y - 0.5 + ic_size / 2)}" '
+                f'width="{_num(2 * unit)}" height="{_num(ic_size / 2 * unit)}" '
+                'fill="#808080" stroke="#000000" stroke-width="3"/>'
+            )
+
+        # Component bodies, then the legs on top of them
+        for start, end, color, name in self._components:
+            parts.append(
+                f'<line x1="{self._x(start[0] + 0.5)}" y1="{self._y(start[1] + 0.5)}" '
+                f'x2="{self._x(end[0] + 0.5)}" y2="{self._y(end[1] + 0.5)}" '
+                f'stroke="{escape(color)}" stroke-width="10" stroke-linecap="round"/>'
+            )
+        parts.append('<g fill="#000000">')
+        for start, end, _, _ in self._components:
+            for x, y in (start, end):
+                parts.append(
+                    f'<circle cx="{self._x(x + 0.5)}" cy="{self._y(y + 0.5)}" '
+                    f'r="{_num(0.15 * unit)}"/>'
+                )
+        parts.append("</g>")
+
+        # Track breaks
+        for col, (y_start, y_end) in self._breaks:
+            parts.append(
+                f'<line x1="{self._x(col + 0.5)}" y1="{self._y(y_start)}" '
+                f'x2="{self._x(col + 0.5)}" y2="{self._y(y_end)}" '
+                'stroke="#000000" stroke-width="10" stroke-dasharray="20 10"/>'
+            )
+
+        # Names
+        for start, _, _, name in self._components:
+            if name:
+                parts.append(
+                    self._text(start[0], start[1] + 0.5, name, 14, rotate=True)
+                )
+        for (x, y), ic_size, name in self._ics:
+            if name:
+                parts.append(
+                    self._text(x, y + ic_size / 4, name, 14, anchor="end", rotate=True)
+                )
+
+        parts.append("</svg>")
+
+        return "\n".join(parts) + "\n"
+
+    def to_text(self):
+        """
+        Returns the board as a text grid, top row first: "." is an empty hole,
+        "o" a component leg, "|" a component body, "#" an IC and "x" a break,
+        followed by a legend of the components.
+        """
+
+        grid = [["." for _ in range(self.N)] for _ in range(self.N)]
+
+        def mark(x, y, char):
+            if 0 <= x < self.N and 0 <= y < self.N:
+                grid[y][x] = char
+
+        for (x, y), ic_size, _ in self._ics:
+            for ic_x in range(x, x + 2):
+                for ic_y in range(y, y + ic_size // 2):
+                    mark(ic_x, ic_y, "#")
+
+        for col, (y_start, y_end) in self._breaks:
+            if not 0 <= col < self.N:
+                continue
+            for y in range(max(0, y_start), min(self.N, y_end)):
+                if grid[y][col] == ".":
+                    mark(col, y, "x")
+
+        for start, end, _, _ in self._components:
+            if start[0] == end[0]:
+                for y in range(min(start[1], end[1]) + 1, max(start[1], end[1])):
+                    mark(start[0], y, "|")
+            mark(start[0], start[1], "o")
+            mark(end[0], end[1], "o")
+
+        width = max(len(row_label(self.N - 1)), 1)
+        lines = [" " * width + "".join(f"{x + 1:>3}" for x in range(self.N))]
+        for y in reversed(range(self.N)):
+            lines.append(
+                f"{row_label(y):>{width}}" + "".join(f"{c:>3}" for c in grid[y])
+            )
+
+        for start, end, _, name in self._components:
+            if name:
+                lines.append(
+                    f"{name}: {start[0] + 1}{row_label(start[1])}"
+                    f"-{end[0] + 1}{row_label(end[1])}"
+                )
+        for (x, y), _, name in self._ics:
+            if name:
+                lines.append(f"{name}: IC at {x + 1}{row_label(y)}")
+
+        return "\n".join(lines) + "\n"
+
+    def savefig(self, file_name):
+        """
+        Writes the board as SVG, or as a text grid if file_name ends in .txt.
+        """
+
+        file_name = str(file_name)
+        text = self.to_text() if file_name.endswith(".txt") else self.to_svg()
+        with open(file_name, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
@@ -0,0 +1,94 @@
+import random
+
+from wadjet.components import (
+    Resistor,
+    Capacitor,
+    OpAmp,
+    SchmittTrigger,
+    BJT,
+)
+
+
+def randomCircuit(
+    num_components,
+    seed=0,
+    fan_out=3,
+    ic_fraction=0.2,
+    max_package_size=4,
+    unused_ic_pins=0.1,
+):
+    """
+    Returns a random but placeable (component_list, connections) pair, the
+    same for the same arguments, with about ic_fraction of the components ICs
+    and nets of 2 to fan_out legs.
+    """
+
+    rng = random.Random(seed)
+
+    component_list = []
+    for i in range(num_components):
+        if rng.random() < ic_fraction:
+            ic_type = rng.choice([OpAmp, SchmittTrigger])
+            package_size = rng.randint(1, max_package_size)
+            component_list.append(ic_type(f"U{i}", package_size=package_size))
+        else:
+            kind = rng.choice(["R", "C", "Q"])
+            if kind == "R":
+                component_list.append(Resistor(f"R{i}"))
+            elif kind == "C":
+                component_list.append(Capacitor(f"C{i}"))
+            else:
+                component_list.append(BJT(f"Q{i}", bjt_type="npn"))
+
+    ic_pins = []
+    legs = []
+    for component in component_list:
+        if component.ic:
+            pins = component.unique_leg_names()
+            ic_pins.extend(
+                pin for pin in pins[0] + pins[1] if rng.random() >= unused_ic_pins
+            )
+        else:
+            legs.extend(component.unique_leg_names())
+
+    rng.shuffle(ic_pins)
+    rng.shuffle(legs)
+
+    def component_of(pin):
+        return pin.split("_")[0]
+
+    # Each IC pin starts its own net, so no net has two IC pins
+    nets = [[pin] for pin in ic_pins]
+    num_nets = max(len(nets), (len(ic_pins) + len(legs)) // max(2, fan_out))
+    nets += [[] for _ in range(num_nets - len(nets))]
+    net_components = [{component_of(pin) for pin in net} for net in nets]
+
+    def join(leg, candidates, limit):
+        for n in candidates:
+            if len(nets[n]) < limit and component_of(leg) not in net_components[n]:
+                nets[n].append(leg)
+                net_components[n].add(component_of(leg))
+                return True
+        return False
+
+    for leg in legs:
+        if not (
+            join(leg, rng.sample(range(len(nets)), min(len(nets), 4)), fan_out)
+            or join(leg, range(len(nets)), fan_out)
+        ):
+            nets.append([leg])
+            net_components.append({component_of(leg)})
+
+    # Every leg of a two or three legged component needs a strip, so a leg left
+    # on its own joins another net even if that exceeds fan_out. An IC pin on
+    # its own is left unconnected.
+    ic_pins = set(ic_pins)
+    for n, net in enumerate(nets):
+        if len(net) == 1 and net[0] not in ic_pins:
+            others = [m for m in range(len(nets)) if m != n and len(nets[m]) > 0]
+            if join(net[0], others, len(legs) + 1):
+                net.clear()
+
+    connections = {net[0]: net[1:] for net in nets if len(net) >= 2}
+
+    return component_list, connections